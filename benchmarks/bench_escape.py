@@ -0,0 +1,67 @@
+import timeit
+from html import escape
+
+from corpus import generate_corpus
+from markdown import block_markdown
+from markdown.block_markdown import markdown_to_html_node
+
+
+def best_of(cases, number, rounds=25):
+    timings = {label: [] for label, _ in cases}
+    for _ in range(rounds):
+        for label, func in cases:
+            timings[label].append(timeit.timeit(func, number=number) / number)
+
+    return [(label, min(timings[label])) for label, _ in cases]
+
+
+def report(title, results):
+    print(title)
+    baseline = results[0][1]
+    for label, seconds in results:
+        change = (seconds / baseline - 1) * 100
+        print(f"  {label:<22} {seconds * 1e3:8.2f} ms/page  {change:+6.1f}%")
+
+
+def without_escaping(func):
+    def wrapper():
+        block_markdown.escape = lambda text, quote=True: text
+        try:
+            return func()
+        finally:
+            block_markdown.escape = escape
+
+    return wrapper
+
+
+def main():
+    document = generate_corpus(1, seed=0, paragraphs=200)[0]
+    tree = markdown_to_html_node(document)
+
+    report(
+        "serialize",
+        best_of(
+            (
+                ("ParentNode.to_html", tree.to_html),
+                ("escape serialized page", lambda: escape(tree.to_html(), quote=False)),
+            ),
+            number=10,
+        ),
+    )
+
+    parse = lambda: markdown_to_html_node(document)
+    report(
+        "parse",
+        best_of(
+            (
+                ("unescaped blocks", without_escaping(parse)),
+                ("escaped blocks", parse),
+            ),
+            number=3,
+            rounds=40,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import timeit
+
+from markdown.textnode import TextNode, TextType
+from markdown.inline_markdown import (
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+
+SENTENCE = (
+    "Some **bold words** and _italic words_ with `inline code`, "
+    "an ![image](/images/tom.png) and a [link](/blog/tom) to follow. "
+)
+
+
+def multi_pass_text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+
+    return nodes
+
+
+def bench(label, func, text, number):
+    seconds = min(timeit.repeat(lambda: func(text), number=number, repeat=5))
+    print(f"{label:<12} {seconds / number * 1e6:10.1f} us/call")
+
+    return seconds
+
+
+def main():
+    for sentences in (1, 20, 200):
+        text = SENTENCE * sentences
+        number = max(10, 2000 // sentences)
+
+        assert multi_pass_text_to_textnodes(text) == text_to_textnodes(text)
+
+        print(f"paragraph of {sentences} sentence(s), {len(text)} chars:")
+        before = bench("multi-pass", multi_pass_text_to_textnodes, text, number)
+        after = bench("single-pass", text_to_textnodes, text, number)
+        print(f"{'speedup':<12} {before / after:10.2f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import re
+import timeit
+
+from markdown.textnode import TextNode, TextType
+from markdown.inline_markdown import split_nodes_image, split_nodes_link
+
+SENTENCE = (
+    "See ![the map](/images/map.png) of [Rivendell](/blog/rivendell) and "
+    "[Lothlorien](/blog/lothlorien) before reading on. "
+)
+
+
+def legacy_partition_nodes_by_media(old_nodes, media_asset_type):
+    new_nodes = []
+
+    for node in old_nodes:
+        if node.text_type != TextType.TEXT:
+            new_nodes.append(node)
+            continue
+
+        text_content = node.text
+        if media_asset_type == TextType.IMAGE:
+            pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
+            delimiter_format = "![{}]({})"
+        else:
+            pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
+            delimiter_format = "[{}]({})"
+
+        asset_list = re.findall(pattern, text_content)
+        if len(asset_list) == 0:
+            new_nodes.append(node)
+            continue
+
+        for alt_text, link in asset_list:
+            sections = text_content.split(delimiter_format.format(alt_text, link), 1)
+            if len(sections[0]) != 0:
+                new_nodes.append(TextNode(sections[0], TextType.TEXT))
+            new_nodes.append(TextNode(alt_text, media_asset_type, link))
+            text_content = sections[1]
+
+        if len(text_content) != 0:
+            new_nodes.append(TextNode(text_content, TextType.TEXT))
+
+    return new_nodes
+
+
+def legacy(nodes):
+    nodes = legacy_partition_nodes_by_media(nodes, TextType.IMAGE)
+    return legacy_partition_nodes_by_media(nodes, TextType.LINK)
+
+
+def current(nodes):
+    return split_nodes_link(split_nodes_image(nodes))
+
+
+def main():
+    for sentences in (1, 50, 500):
+        nodes = [TextNode(SENTENCE * sentences, TextType.TEXT)]
+        number = max(5, 2000 // sentences)
+        assert legacy(nodes) == current(nodes)
+
+        print(f"{sentences} sentence(s):")
+        for label, func in (("split + findall", legacy), ("finditer", current)):
+            seconds = min(timeit.repeat(lambda: func(nodes), number=number, repeat=5))
+            print(f"  {label:<16} {seconds / number * 1e6:10.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
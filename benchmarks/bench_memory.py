@@ -0,0 +1,68 @@
+import tracemalloc
+
+from markdown.block_markdown import markdown_to_html_node
+from markdown.htmlnode import LeafNode
+from markdown.textnode import TextNode, TextType
+
+PARAGRAPH = (
+    "Some **bold words** and _italic words_ with `inline code`, "
+    "an ![image](/images/tom.png) and a [link](/blog/tom) to follow.\n\n"
+)
+
+
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+
+class DictLeafNode:
+    def __init__(self, tag, value, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = None
+        self.props = props
+
+
+def measure(build):
+    tracemalloc.start()
+    kept = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+
+    return peak
+
+
+def bench_nodes(count):
+    text = TextType.TEXT
+    layouts = (
+        ("TextNode", lambda: [TextNode("w", text) for _ in range(count)]),
+        ("dict TextNode", lambda: [DictTextNode("w", text) for _ in range(count)]),
+        ("LeafNode", lambda: [LeafNode("b", "w") for _ in range(count)]),
+        ("dict LeafNode", lambda: [DictLeafNode("b", "w") for _ in range(count)]),
+    )
+
+    print(f"{count} nodes:")
+    for label, build in layouts:
+        peak = measure(build)
+        print(f"  {label:<14} {peak / count:8.1f} bytes/node")
+
+
+def bench_document(paragraphs):
+    markdown = PARAGRAPH * paragraphs
+    peak = measure(lambda: markdown_to_html_node(markdown))
+    print(
+        f"markdown_to_html_node over {paragraphs} paragraphs "
+        f"({len(markdown) / 1e6:.1f} MB): peak {peak / 1e6:.1f} MB"
+    )
+
+
+def main():
+    bench_nodes(200_000)
+    bench_document(20_000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+import random
+
+WORDS = (
+    "ring hobbit elf wizard shire mountain river forest song tale road "
+    "shadow light tower king journey fellowship council dwarf lore age"
+).split()
+
+
+def sentence(rng, words, link_density, image_density, emphasis_density):
+    parts = []
+
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        roll = rng.random()
+
+        if roll < link_density:
+            word = f"[{word}](/blog/{rng.choice(WORDS)})"
+        elif roll < link_density + image_density:
+            word = f"![{word}](/images/{rng.choice(WORDS)}.png)"
+        elif roll < link_density + image_density + emphasis_density:
+            word = rng.choice(("**{}**", "_{}_", "`{}`")).format(word)
+
+        parts.append(word)
+
+    return " ".join(parts).capitalize() + "."
+
+
+def paragraph(rng, sentences, **densities):
+    return " ".join(
+        sentence(rng, rng.randint(6, 14), **densities) for _ in range(sentences)
+    )
+
+
+def generate_page(
+    rng,
+    paragraphs=10,
+    paragraph_sentences=5,
+    link_density=0.05,
+    image_density=0.01,
+    emphasis_density=0.1,
+    list_ratio=0.15,
+    code_ratio=0.1,
+):
+    densities = {
+        "link_density": link_density,
+        "image_density": image_density,
+        "emphasis_density": emphasis_density,
+    }
+    blocks = [f"# {sentence(rng, 4, 0, 0, 0)}"]
+
+    for index in range(paragraphs):
+        roll = rng.random()
+
+        if roll < list_ratio:
+            items = rng.randint(3, 8)
+            if rng.random() < 0.5:
+                lines = [f"- {sentence(rng, 6, **densities)}" for _ in range(items)]
+            else:
+                lines = [
+                    f"{idx}. {sentence(rng, 6, **densities)}"
+                    for idx in range(1, items + 1)
+                ]
+            blocks.append("\n".join(lines))
+        elif roll < list_ratio + code_ratio:
+            code = "\n".join(
+                f"    {rng.choice(WORDS)}()" for _ in range(rng.randint(2, 10))
+            )
+            blocks.append(f"```\n{code}\n```")
+        elif index % 7 == 3:
+            blocks.append(f"## {sentence(rng, 3, 0, 0, 0)}")
+        else:
+            blocks.append(paragraph(rng, paragraph_sentences, **densities))
+
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate_corpus(pages=100, seed=0, **options):
+    rng = random.Random(seed)
+    return [generate_page(rng, **options) for _ in range(pages)]
+
+
+def write_corpus(directory, pages=100, seed=0, **options):
+    for index, markdown in enumerate(generate_corpus(pages, seed, **options)):
+        page_dir = os.path.join(directory, f"section-{index % 10}", f"page-{index}")
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, "index.md"), "w") as file:
+            file.write(markdown)
@@ -0,0 +1,149 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import tempfile
+import time
+import timeit
+
+from corpus import generate_corpus, write_corpus
+from markdown.inline_markdown import text_to_textnodes
+from markdown.block_markdown import markdown_to_blocks, markdown_to_html_node
+from generator.page_generator import traverse_and_generate_html
+
+TEMPLATE = (
+    "<html><head><title>{{ Title }}</title></head>"
+    "<body>{{ Content }}</body></html>"
+)
+
+
+def best_of(func, number, repeat=5):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def run_benchmarks(pages, paragraphs, paragraph_sentences, seed):
+    corpus = generate_corpus(
+        pages, seed, paragraphs=paragraphs, paragraph_sentences=paragraph_sentences
+    )
+    document = corpus[0]
+    paragraph = max(markdown_to_blocks(document), key=len)
+    tree = markdown_to_html_node(document)
+
+    results = {
+        "text_to_textnodes": best_of(lambda: text_to_textnodes(paragraph), 200),
+        "markdown_to_blocks": best_of(lambda: markdown_to_blocks(document), 200),
+        "markdown_to_html_node": best_of(lambda: markdown_to_html_node(document), 20),
+        "ParentNode.to_html": best_of(tree.to_html, 50),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        content = os.path.join(tmp, "content")
+        template_path = os.path.join(tmp, "template.html")
+        write_corpus(
+            content,
+            pages,
+            seed,
+            paragraphs=paragraphs,
+            paragraph_sentences=paragraph_sentences,
+        )
+        with open(template_path, "w") as file:
+            file.write(TEMPLATE)
+
+        def full_build():
+            traverse_and_generate_html(
+                content, template_path, os.path.join(tmp, "docs"), "/"
+            )
+
+        with open(os.devnull, "w") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                results["traverse_and_generate_html"] = best_of(full_build, 1, 3)
+
+    return results
+
+
+def compare(baseline_path, current_path, threshold):
+    with open(baseline_path) as file:
+        baseline = json.load(file)["results"]
+    with open(current_path) as file:
+        current = json.load(file)["results"]
+
+    regressions = 0
+    print(f"{'benchmark':<28} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, seconds in current.items():
+        if name not in baseline:
+            continue
+
+        change = seconds / baseline[name] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+
+        print(
+            f"{name:<28} {baseline[name] * 1e3:>10.3f}ms {seconds * 1e3:>10.3f}ms "
+            f"{change:>+8.1%}{flag}"
+        )
+
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the markdown pipeline.",
+        epilog="Run from the repository root with ./bench.sh [options]; the other "
+        "benchmarks/*.py scripts need PYTHONPATH=src as well.",
+    )
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--paragraphs", type=int, default=20)
+    parser.add_argument("--paragraph-sentences", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="compare two result files instead of running benchmarks",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown reported as a regression (default: 0.10)",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.compare:
+        regressions = compare(*args.compare, args.threshold)
+        raise SystemExit(1 if regressions else 0)
+
+    results = run_benchmarks(
+        args.pages, args.paragraphs, args.paragraph_sentences, args.seed
+    )
+    for name, seconds in results.items():
+        print(f"{name:<28} {seconds * 1e3:>10.3f} ms")
+
+    if args.output:
+        data = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "options": {
+                "pages": args.pages,
+                "paragraphs": args.paragraphs,
+                "paragraph_sentences": args.paragraph_sentences,
+                "seed": args.seed,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as file:
+            json.dump(data, file, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,3 +2,22 @@ STATIC_FILES_DIRECTORY = "static"
 INPUT_CONTENT_DIRECTORY = "content"
 TEMPLATE_FILE_PATH = "template.html"
 OUTPUT_DIRECTORY = "docs"
+MANIFEST_FILE_PATH = ".ssg_cache/manifest.json"
+GENERATOR_VERSION = "6"
+TEMPLATES_DIRECTORY = "templates"
+PARSER_VERSION = "7"
+HTML_CACHE_DIRECTORY = ".ssg_cache/html"
+HTML_CACHE_MAX_BYTES = 256 * 1024 * 1024
+HIGHLIGHT_CACHE_DIRECTORY = ".ssg_cache/highlight"
+HIGHLIGHT_STYLESHEET = "highlight.css"
+STATIC_MANIFEST_FILE_PATH = ".ssg_cache/static.json"
+STATIC_COPY_WORKERS = 8
+PROFILE_REPORT_PATH = ".ssg_cache/profile.json"
+STREAMING_THRESHOLD_BYTES = 8 * 1024 * 1024
+LISTING_SECTIONS = ("blog",)
+LISTING_PAGE_SIZE = 10
+LISTING_MANIFEST_FILE_PATH = ".ssg_cache/listings.json"
+SUMMARY_MAX_CHARS = 200
+IMAGE_CACHE_DIRECTORY = ".ssg_cache/images"
+IMAGE_VARIANT_WIDTHS = (480, 960, 1440)
+IMAGE_LOCK_TIMEOUT = 30
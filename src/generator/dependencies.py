@@ -0,0 +1,118 @@
+import os
+import posixpath
+
+from generator.listing import page_url
+
+ENTRY_REASONS = (
+    ("source", "source changed"),
+    ("template_path", "template switched"),
+    ("template", "template changed"),
+    ("basepath", "basepath changed"),
+    ("version", "generator version changed"),
+    ("output", "output path changed"),
+    ("images", "images changed"),
+    ("highlighter", "highlighter changed"),
+)
+
+
+def is_external(href):
+    return href.startswith("//") or ":" in href.split("/", 1)[0]
+
+
+def internal_links(hrefs):
+    links = {}
+
+    for href in hrefs:
+        if is_external(href):
+            continue
+
+        link = href.split("#", 1)[0].split("?", 1)[0]
+        if not link:
+            continue
+        if link.startswith("/"):
+            link = link.rstrip("/") or "/"
+
+        links[link] = None
+
+    return list(links)
+
+
+def resolve_link(link, output_path, destination):
+    if link.startswith("/"):
+        return link
+
+    relative = os.path.relpath(output_path, destination).replace(os.sep, "/")
+    base = posixpath.dirname("/" + relative)
+    return posixpath.normpath(posixpath.join(base, link)).rstrip("/") or "/"
+
+
+def entry_reasons(previous_entry, entry):
+    if previous_entry is None:
+        return ["new page"]
+
+    reasons = [
+        reason
+        for key, reason in ENTRY_REASONS
+        if previous_entry.get(key) != entry.get(key)
+    ]
+    if "info" not in previous_entry:
+        reasons.append("no recorded page info")
+
+    return reasons
+
+
+def link_dependents(entries, destination):
+    dependents = {}
+
+    for src_path, entry in entries.items():
+        for link in entry.get("info", {}).get("links", []):
+            url = resolve_link(link, entry["output"], destination)
+            dependents.setdefault(url, set()).add(src_path)
+
+    return dependents
+
+
+def changed_targets(previous, current, destination):
+    targets = {}
+
+    for src_path, entry in current.items():
+        url = page_url(entry["output"], destination)
+        previous_entry = previous.get(src_path)
+
+        if previous_entry is None or "info" not in previous_entry:
+            targets[url] = "added"
+        elif previous_entry["info"].get("title") != entry["info"].get("title"):
+            targets[url] = "retitled"
+
+    for src_path, entry in previous.items():
+        if src_path not in current:
+            targets[page_url(entry["output"], destination)] = "removed"
+
+    return targets
+
+
+def linked_pages(previous, current, destination, scheduled):
+    dependents = link_dependents(current, destination)
+    reasons = {}
+
+    for url, change in sorted(changed_targets(previous, current, destination).items()):
+        for src_path in sorted(dependents.get(url, ())):
+            if src_path in scheduled:
+                continue
+            reasons.setdefault(src_path, []).append(f"links to {url} ({change})")
+
+    return reasons
+
+
+def explain(reasons, linked=None):
+    if not reasons:
+        print("Nothing to rebuild: every page is up to date.")
+    else:
+        print("Rebuild reasons:")
+        for src_path in sorted(reasons):
+            print(f" * {src_path}: {', '.join(reasons[src_path])}")
+
+    if linked:
+        print("Linking pages (output unchanged, not re-rendered):")
+        for src_path in sorted(linked):
+            print(f" * {src_path}: {', '.join(linked[src_path])}")
@@ -0,0 +1,106 @@
+import itertools
+
+FRONT_MATTER_DELIMITERS = {"---": ":", "+++": "="}
+STRING_KEYS = ("title", "summary", "template")
+
+
+def parse_string(value):
+    value = value.strip()
+
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+
+    return value
+
+
+def parse_scalar(value):
+    value = value.strip()
+
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+
+    if value.startswith("[") and value.endswith("]"):
+        inner = value[1:-1].strip()
+        return [parse_scalar(item) for item in inner.split(",")] if inner else []
+
+    lowered = value.lower()
+    if lowered in ("true", "yes"):
+        return True
+    if lowered in ("false", "no"):
+        return False
+
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def parse_front_matter(lines, separator):
+    metadata = {}
+    list_key = None
+
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        if list_key is not None and stripped.startswith("- "):
+            metadata[list_key].append(parse_scalar(stripped[2:]))
+            continue
+
+        key, found, value = line.partition(separator)
+        if not found:
+            raise ValueError(f"Invalid front matter line: {line!r}")
+
+        key = key.strip()
+        if key in STRING_KEYS:
+            metadata[key] = parse_string(value)
+            list_key = None
+        elif value.strip():
+            metadata[key] = parse_scalar(value)
+            list_key = None
+        else:
+            metadata[key] = []
+            list_key = key
+
+    return metadata
+
+
+def split_front_matter_lines(lines):
+    lines = iter(lines)
+    first = next(lines, None)
+
+    if first is None:
+        return {}, iter(())
+
+    delimiter = first.strip()
+    if delimiter not in FRONT_MATTER_DELIMITERS:
+        return {}, itertools.chain([first], lines)
+
+    header = []
+    for line in lines:
+        if line.strip() == delimiter:
+            break
+        header.append(line)
+    else:
+        return {}, itertools.chain([first], header)
+
+    return parse_front_matter(header, FRONT_MATTER_DELIMITERS[delimiter]), lines
+
+
+def split_front_matter(markdown):
+    if not markdown.startswith(tuple(FRONT_MATTER_DELIMITERS)):
+        return {}, markdown
+
+    lines = markdown.split("\n")
+    metadata, rest = split_front_matter_lines(lines)
+    body = "\n".join(rest)
+
+    return metadata, body
+
+
+def read_front_matter(path):
+    with open(path) as file:
+        metadata, _ = split_front_matter_lines(line.rstrip("\n") for line in file)
+
+    return metadata
@@ -0,0 +1,16 @@
+from generator.html_cache import HTMLCache
+
+
+class CachedHighlighter:
+    def __init__(self, highlighter, directory):
+        self.highlighter = highlighter
+        self.version = highlighter.version
+        self.cache = HTMLCache(directory, version="highlight")
+
+    def __call__(self, code, language):
+        key = "\0".join((self.version, language, code))
+        value = self.cache.render(
+            key, lambda _: {"html": self.highlighter(code, language)}
+        )
+
+        return value["html"]
@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+
+from config import PARSER_VERSION, HTML_CACHE_MAX_BYTES
+
+
+class HTMLCache:
+    def __init__(self, directory, max_bytes=HTML_CACHE_MAX_BYTES, version=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version if version is not None else PARSER_VERSION
+
+    def key(self, markdown):
+        digest = hashlib.sha256(self.version.encode())
+        digest.update(b"\0")
+        digest.update(markdown.encode())
+
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def get(self, markdown):
+        path = self.path(self.key(markdown))
+
+        try:
+            with open(path) as file:
+                value = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        os.utime(path)
+        return value
+
+    def put(self, markdown, value):
+        path = self.path(self.key(markdown))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(value, file)
+
+        os.replace(tmp_path, path)
+
+    def render(self, markdown, render_value):
+        value = self.get(markdown)
+
+        if value is None:
+            value = render_value(markdown)
+            self.put(markdown, value)
+
+        return value
+
+    def prune(self):
+        if not os.path.isdir(self.directory):
+            return 0
+
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+
+            os.remove(path)
+            total -= size
+            removed += 1
+
+        return removed
@@ -0,0 +1,244 @@
+import hashlib
+import json
+import os
+import struct
+import time
+
+from config import IMAGE_CACHE_DIRECTORY, IMAGE_VARIANT_WIDTHS, IMAGE_LOCK_TIMEOUT
+from generator.manifest import hash_file
+from generator.static_handler import copy_file, is_unchanged
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+IMAGE_EXTENSIONS = (".png", ".gif", ".jpg", ".jpeg")
+JPEG_FRAME_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7}
+JPEG_FRAME_MARKERS |= {0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def _jpeg_size(file):
+    file.seek(2)
+    while True:
+        byte = file.read(1)
+        while byte and byte != b"\xff":
+            byte = file.read(1)
+        while byte == b"\xff":
+            byte = file.read(1)
+        if not byte:
+            return None
+
+        marker = byte[0]
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            continue
+
+        header = file.read(2)
+        if len(header) < 2:
+            return None
+        (length,) = struct.unpack(">H", header)
+
+        if marker in JPEG_FRAME_MARKERS:
+            frame = file.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:])
+            return width, height
+
+        file.seek(length - 2, os.SEEK_CUR)
+
+
+def image_size(path):
+    with open(path, "rb") as file:
+        head = file.read(24)
+
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head.startswith(b"\xff\xd8"):
+            return _jpeg_size(file)
+
+    return None
+
+
+def resize_image(src_path, dest_path, width):
+    with Image.open(src_path) as image:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+
+        tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+        resized.save(tmp_path, format=image.format)
+
+    os.replace(tmp_path, dest_path)
+
+
+def pipeline_version(widths):
+    digest = hashlib.sha256(repr(widths).encode())
+    digest.update(b"pillow" if Image is not None else b"headers")
+
+    return digest.hexdigest()[:16]
+
+
+def variant_url(url, width):
+    base, ext = os.path.splitext(url)
+    return f"{base}-{width}w{ext}"
+
+
+class ImagePipeline:
+    def __init__(
+        self,
+        static_root,
+        destination,
+        cache_dir=IMAGE_CACHE_DIRECTORY,
+        widths=IMAGE_VARIANT_WIDTHS,
+    ):
+        self.static_root = static_root
+        self.destination = destination
+        self.cache_dir = cache_dir
+        self.widths = tuple(sorted(widths))
+        self.version = pipeline_version(self.widths)
+        self.entries = {}
+
+    def source(self, src):
+        if not src.startswith("/") or src.startswith("//"):
+            return None, None
+
+        url = src.split("#", 1)[0].split("?", 1)[0]
+        path = os.path.join(self.static_root, url.lstrip("/"))
+        if os.path.splitext(path)[1].lower() not in IMAGE_EXTENSIONS:
+            return None, None
+
+        return url, path
+
+    def lookup(self, src):
+        url, path = self.source(src)
+        if url is None:
+            return None, None
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return url, None
+
+        key = (url, stat.st_mtime_ns, stat.st_size)
+        if key not in self.entries:
+            self.entries[key] = self.load_entry(path)
+
+        return url, self.entries[key]
+
+    def stamp(self, srcs):
+        digest = hashlib.sha256(self.version.encode())
+
+        for src in sorted(set(srcs)):
+            url, path = self.source(src)
+            if url is None:
+                continue
+
+            try:
+                stat = os.stat(path)
+                digest.update(f"\0{url}\0{stat.st_size}\0{stat.st_mtime_ns}".encode())
+            except OSError:
+                digest.update(f"\0{url}\0missing".encode())
+
+        return digest.hexdigest()[:16]
+
+    def __call__(self, src):
+        url, entry = self.lookup(src)
+        if entry is None:
+            return None
+
+        width, height = entry["width"], entry["height"]
+        props = {"width": str(width), "height": str(height)}
+        if not entry["variants"]:
+            return props
+
+        candidates = [
+            f"{variant_url(url, variant_width)} {variant_width}w"
+            for variant_width, _ in entry["variants"]
+        ]
+        candidates.append(f"{url} {width}w")
+
+        props["srcset"] = ", ".join(candidates)
+        props["sizes"] = f"(max-width: {width}px) 100vw, {width}px"
+        return props
+
+    def entry_path(self, digest):
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def read_entry(self, digest):
+        try:
+            with open(self.entry_path(digest)) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def load_entry(self, path):
+        digest = hash_file(path)
+        entry = self.read_entry(digest)
+        if entry is not None:
+            return entry
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        lock_path = os.path.join(self.cache_dir, f"{digest}.lock")
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL))
+        except FileExistsError:
+            deadline = time.monotonic() + IMAGE_LOCK_TIMEOUT
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                entry = self.read_entry(digest)
+                if entry is not None:
+                    return entry
+
+        try:
+            return self.process(digest, path)
+        finally:
+            if os.path.exists(lock_path):
+                os.remove(lock_path)
+
+    def process(self, digest, path):
+        size = image_size(path)
+        if size is None:
+            return None
+
+        width, height = size
+        variants = []
+        if Image is not None:
+            ext = os.path.splitext(path)[1].lower()
+            for variant_width in self.widths:
+                if variant_width >= width:
+                    break
+
+                name = f"{digest}-{variant_width}{ext}"
+                resize_image(path, os.path.join(self.cache_dir, name), variant_width)
+                variants.append([variant_width, name])
+
+        entry = {"width": width, "height": height, "variants": variants}
+        tmp_path = f"{self.entry_path(digest)}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(entry, file)
+        os.replace(tmp_path, self.entry_path(digest))
+
+        return entry
+
+    def publish(self, srcs):
+        published = []
+
+        for src in sorted(set(srcs)):
+            url, entry = self.lookup(src)
+            if entry is None:
+                continue
+
+            for variant_width, name in entry["variants"]:
+                relative = variant_url(url, variant_width).lstrip("/")
+                cache_path = os.path.join(self.cache_dir, name)
+                dest_path = os.path.join(self.destination, relative)
+                published.append(relative)
+                if is_unchanged(cache_path, dest_path):
+                    continue
+
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                copy_file(cache_path, dest_path, link=True)
+
+        return published
@@ -0,0 +1,47 @@
+import os
+
+from generator.dependencies import resolve_link
+from generator.listing import page_url
+from generator.static_handler import scan_tree
+
+
+def site_urls(output_paths, destination):
+    urls = set()
+
+    for output_path in output_paths:
+        relative = os.path.relpath(output_path, destination).replace(os.sep, "/")
+        urls.add("/" + relative)
+        urls.add(page_url(output_path, destination))
+
+    return urls
+
+
+def find_dangling_links(records, known_urls, destination):
+    dangling = []
+
+    for src_path, dest_path, info in records:
+        for link in info.get("links", []) + info.get("images", []):
+            if resolve_link(link, dest_path, destination) not in known_urls:
+                dangling.append((src_path, link))
+
+    return dangling
+
+
+def check_links(records, listing_outputs, destination, static_root):
+    output_paths = [dest_path for _, dest_path, _ in records]
+    output_paths.extend(listing_outputs)
+    if os.path.isdir(static_root):
+        _, files = scan_tree(static_root)
+        output_paths.extend(os.path.join(destination, path) for path, _ in files)
+
+    known_urls = site_urls(output_paths, destination)
+    dangling = find_dangling_links(records, known_urls, destination)
+    for src_path, url in dangling:
+        print(f" * {src_path}: broken link {url}")
+
+    checked = sum(
+        len(info.get("links", [])) + len(info.get("images", []))
+        for _, _, info in records
+    )
+    print(f"Checked {checked} link(s), {len(dangling)} broken")
+    return dangling
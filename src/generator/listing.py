@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+
+from config import LISTING_SECTIONS, LISTING_PAGE_SIZE
+from markdown.htmlnode import LeafNode, ParentNode
+from generator.manifest import hash_file, remove_output
+from generator.template import load_template
+from generator.output_writer import OutputFile
+
+
+def page_url(dest_path, destination):
+    relative = os.path.relpath(dest_path, destination).replace(os.sep, "/")
+    if relative == "index.html":
+        return "/"
+    if relative.endswith("/index.html"):
+        return "/" + relative[: -len("/index.html")]
+
+    return "/" + relative
+
+
+def build_index(records, source, destination, sections=LISTING_SECTIONS):
+    index = {section: [] for section in sections}
+
+    for src_path, dest_path, info in records:
+        relative = os.path.relpath(src_path, source)
+        section, sep, rest = relative.partition(os.sep)
+        if not sep or section not in index or rest == "index.md":
+            continue
+
+        index[section].append(
+            {
+                "url": page_url(dest_path, destination),
+                "title": info["title"],
+                "date": info.get("date") or "",
+                "summary": info.get("summary") or "",
+            }
+        )
+
+    for entries in index.values():
+        entries.sort(key=lambda entry: (entry["date"], entry["title"], entry["url"]))
+
+    return index
+
+
+def paginate(entries, size=LISTING_PAGE_SIZE):
+    return [entries[i : i + size] for i in range(0, len(entries), size)]
+
+
+def listing_url(section, number):
+    return f"/{section}/page/{number}"
+
+
+def listing_to_html_node(section, entries, number, total):
+    items = []
+    for entry in reversed(entries):
+        children = [LeafNode("a", entry["title"], {"href": entry["url"]})]
+        if entry["date"]:
+            children.append(LeafNode("time", entry["date"]))
+        if entry["summary"]:
+            children.append(LeafNode("p", entry["summary"]))
+        items.append(ParentNode("li", children))
+
+    navigation = []
+    if number < total:
+        navigation.append(
+            LeafNode("a", "Newer posts", {"href": listing_url(section, number + 1)})
+        )
+    if number > 1:
+        navigation.append(
+            LeafNode("a", "Older posts", {"href": listing_url(section, number - 1)})
+        )
+
+    children = [LeafNode("h1", section.capitalize())]
+    if items:
+        children.append(ParentNode("ul", items))
+    if navigation:
+        children.append(ParentNode("nav", navigation))
+
+    return ParentNode("div", children)
+
+
+def listing_outputs(section, destination, number, total):
+    outputs = [os.path.join(destination, section, "page", str(number), "index.html")]
+    if number == total:
+        outputs.append(os.path.join(destination, section, "index.html"))
+
+    return outputs
+
+
+def listing_digest(entries, number, total, template_hash, basepath):
+    payload = json.dumps([entries, number, total, template_hash, basepath])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_listing_manifest(manifest_path):
+    try:
+        with open(manifest_path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_listing_manifest(manifest_path, listings):
+    manifest_dir = os.path.dirname(manifest_path)
+    if manifest_dir:
+        os.makedirs(manifest_dir, exist_ok=True)
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(listings, file, indent=2, sort_keys=True)
+
+    os.replace(tmp_path, manifest_path)
+
+
+def listing_reason(previous_listing, members):
+    if previous_listing is None:
+        return "new listing page"
+
+    previous_members = previous_listing.get("members", [])
+    added = [url for url in members if url not in previous_members]
+    dropped = [url for url in previous_members if url not in members]
+    if added or dropped:
+        changes = [f"+{url}" for url in added] + [f"-{url}" for url in dropped]
+        return f"members changed ({', '.join(changes)})"
+
+    return "member metadata, navigation, template or basepath changed"
+
+
+def generate_listings(
+    records,
+    source,
+    destination,
+    template_path,
+    basepath,
+    manifest_path,
+    taken=(),
+    explain_rebuilds=False,
+):
+    previous = load_listing_manifest(manifest_path)
+    current = {}
+    template = load_template(template_path)
+    template_hash = hash_file(template_path)
+    written = 0
+
+    for section, entries in build_index(records, source, destination).items():
+        pages = paginate(entries)
+        total = len(pages)
+
+        for number, page_entries in enumerate(pages, 1):
+            digest = listing_digest(
+                page_entries, number, total, template_hash, basepath
+            )
+            for output in listing_outputs(section, destination, number, total):
+                if output in taken:
+                    continue
+
+                members = [entry["url"] for entry in page_entries]
+                current[output] = {"digest": digest, "members": members}
+                previous_listing = previous.get(output)
+                if not isinstance(previous_listing, dict):
+                    previous_listing = None
+                if previous_listing is not None and os.path.isfile(output):
+                    if previous_listing.get("digest") == digest:
+                        continue
+
+                print(f" * listing {section} page {number}/{total} -> {output}")
+                if explain_rebuilds:
+                    print(f"   {listing_reason(previous_listing, members)}")
+                node = listing_to_html_node(section, page_entries, number, total)
+                title = section.capitalize()
+                if number < total:
+                    title = f"{title} (page {number})"
+                os.makedirs(os.path.dirname(output), exist_ok=True)
+                with OutputFile(output) as file:
+                    template.write(file, basepath, Title=title, Content=node)
+                if file.written:
+                    written += 1
+
+    for output in previous:
+        if output not in current and output not in taken:
+            print(f" * removing listing {output}")
+            remove_output(output, destination)
+
+    save_listing_manifest(manifest_path, current)
+    print(f"Listing pages written {written}, unchanged {len(current) - written}")
+    return list(current)
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+
+from config import GENERATOR_VERSION
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def page_entry(
+    source_hash,
+    template_path,
+    template_hash,
+    basepath,
+    output_path,
+    images=None,
+    highlighter=None,
+):
+    return {
+        "source": source_hash,
+        "template_path": template_path,
+        "template": template_hash,
+        "basepath": basepath,
+        "version": GENERATOR_VERSION,
+        "output": output_path,
+        "images": images,
+        "highlighter": highlighter,
+    }
+
+
+def load_manifest(manifest_path):
+    if not os.path.isfile(manifest_path):
+        return {}
+
+    try:
+        with open(manifest_path) as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+    if data.get("version") != GENERATOR_VERSION:
+        return {}
+
+    return data.get("pages", {})
+
+
+def save_manifest(manifest_path, pages):
+    manifest_dir = os.path.dirname(manifest_path)
+    if manifest_dir:
+        os.makedirs(manifest_dir, exist_ok=True)
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(
+            {"version": GENERATOR_VERSION, "pages": pages},
+            file,
+            indent=2,
+            sort_keys=True,
+        )
+
+    os.replace(tmp_path, manifest_path)
+
+
+def remove_output(output_path, root):
+    if os.path.isfile(output_path):
+        os.remove(output_path)
+
+    root = os.path.abspath(root)
+    parent = os.path.dirname(os.path.abspath(output_path))
+
+    while (
+        parent != root
+        and os.path.commonpath([parent, root]) == root
+        and os.path.isdir(parent)
+    ):
+        if os.listdir(parent):
+            break
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
@@ -0,0 +1,52 @@
+import hashlib
+import os
+
+
+class OutputFile:
+    def __init__(self, path):
+        self.path = path
+        self.temp_path = f"{path}.tmp"
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.written = False
+
+    def __enter__(self):
+        self.file = open(self.temp_path, "wb")
+        return self
+
+    def write(self, text):
+        data = text.encode("utf-8")
+        self.digest.update(data)
+        self.size += len(data)
+        self.file.write(data)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+        if exc_type is not None or self.is_unchanged():
+            os.remove(self.temp_path)
+        else:
+            os.replace(self.temp_path, self.path)
+            self.written = True
+
+        return False
+
+    def is_unchanged(self):
+        try:
+            if os.path.getsize(self.path) != self.size:
+                return False
+        except OSError:
+            return False
+
+        digest = hashlib.sha256()
+        with open(self.path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 16), b""):
+                digest.update(chunk)
+
+        return digest.digest() == self.digest.digest()
+
+
+def write_output(path, text):
+    with OutputFile(path) as output:
+        output.write(text)
+
+    return output.written
@@ -1,47 +1,428 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
 
-from markdown.block_markdown import markdown_to_html_node
-from markdown.inline_markdown import extract_title
+import profiler
+from config import (
+    STREAMING_THRESHOLD_BYTES,
+    SUMMARY_MAX_CHARS,
+)
+from markdown.block_markdown import (
+    parse_markdown,
+    markdown_lines_to_html_node,
+    find_block_title,
+)
+from markdown.highlight import get_highlighter, set_highlighter, highlighter_version
+from markdown.images import get_image_processor, set_image_processor, image_stamp
+from generator.listing import generate_listings
+from generator.dependencies import (
+    internal_links,
+    entry_reasons,
+    linked_pages,
+    explain,
+)
+from generator.frontmatter import (
+    read_front_matter,
+    split_front_matter,
+    split_front_matter_lines,
+)
+from generator.template import load_template, resolve_template, rewrite_basepath
+from generator.output_writer import OutputFile, write_output
+from generator.manifest import (
+    hash_file,
+    page_entry,
+    load_manifest,
+    save_manifest,
+    remove_output,
+)
 
 
-def traverse_and_generate_html(source, template_path, destination, basepath):
-    for item in os.listdir(source):
-        src_path = os.path.join(source, item)
-        dest_path = os.path.join(destination, item)
+def html_destination(dest_path):
+    root, ext = os.path.splitext(dest_path)
+    if ext:
+        dest_path = root + ".html"
 
-        if os.path.isfile(src_path):
-            root, ext = os.path.splitext(dest_path)
-            if ext:
-                dest_path = root + ".html"
+    return dest_path
 
-            print(f" * converting {src_path} -> {dest_path}")
-            generate_page(src_path, template_path, dest_path, basepath)
 
-        elif os.path.isdir(src_path):
-            traverse_and_generate_html(src_path, template_path, dest_path, basepath)
+def page_destination(src_path, source, destination):
+    relative = os.path.relpath(src_path, source)
+    return html_destination(os.path.join(destination, relative))
 
 
-def generate_page(from_path, template_path, dest_path, basepath):
+def collect_pages(source, destination):
+    pages = []
+
+    with os.scandir(source) as entries:
+        entries = sorted(entries, key=lambda entry: entry.name)
+
+    for entry in entries:
+        dest_path = os.path.join(destination, entry.name)
+
+        if entry.is_file():
+            pages.append((entry.path, html_destination(dest_path)))
+
+        elif entry.is_dir():
+            pages.extend(collect_pages(entry.path, dest_path))
+
+    return pages
+
+
+def assign_templates(pages, source, template_path, include_drafts=False):
+    planned = []
+
+    for src_path, dest_path in pages:
+        try:
+            with profiler.stage("front matter"):
+                metadata = read_front_matter(src_path)
+        except ValueError:
+            metadata = {}
+        if metadata.get("draft") is True and not include_drafts:
+            continue
+
+        page_template = resolve_template(
+            src_path, source, template_path, metadata.get("template")
+        )
+        planned.append((src_path, dest_path, page_template))
+
+    return planned
+
+
+class BuildPlan:
+    def __init__(self, pages):
+        self.pages = pages
+        self.sources = [src_path for src_path, _, _ in pages]
+        self.destinations = [dest_path for _, dest_path, _ in pages]
+        self.directories = sorted(
+            {os.path.dirname(dest_path) for dest_path in self.destinations}
+        )
+
+    def create_directories(self):
+        for directory in self.directories:
+            os.makedirs(directory, exist_ok=True)
+
+
+def plan_build(source, destination, template_path, include_drafts=False):
+    with profiler.stage("directory walk"):
+        pages = collect_pages(source, destination)
+
+    pages = assign_templates(pages, source, template_path, include_drafts)
+    return BuildPlan(pages)
+
+
+def _install_plugins(highlighter, image_processor):
+    set_highlighter(highlighter)
+    set_image_processor(image_processor)
+
+
+def _render_chunk(chunk, basepath, cache=None):
+    results = []
+
+    for src_path, dest_path, template_path in chunk:
+        try:
+            with profiler.page(src_path):
+                info, written = generate_page(
+                    src_path, template_path, dest_path, basepath, cache
+                )
+            results.append((None, info, written))
+        except Exception as error:
+            results.append((f"{type(error).__name__}: {error}", None, False))
+
+    return results
+
+
+def _chunk_pages(pages, jobs):
+    size = max(1, len(pages) // (jobs * 4))
+    return [pages[i : i + size] for i in range(0, len(pages), size)]
+
+
+def render_pages(pages, basepath, jobs=1, cache=None):
+    if jobs > 1 and len(pages) > 1:
+        chunks = _chunk_pages(pages, jobs)
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_install_plugins,
+            initargs=(get_highlighter(), get_image_processor()),
+        ) as executor:
+            chunk_results = executor.map(
+                _render_chunk,
+                chunks,
+                [basepath] * len(chunks),
+                [cache] * len(chunks),
+            )
+            results = [result for chunk in chunk_results for result in chunk]
+    else:
+        results = _render_chunk(pages, basepath, cache)
+
+    failures = []
+    for (src_path, dest_path, _), (error, _, _) in zip(pages, results):
+        print(f" * converting {src_path} -> {dest_path}")
+        if error is not None:
+            failures.append(f"{src_path}: {error}")
+
+    if failures:
+        details = "\n".join(f"  - {failure}" for failure in failures)
+        raise Exception(f"Failed to generate {len(failures)} page(s):\n{details}")
+
+    if results:
+        written = sum(1 for _, _, page_written in results if page_written)
+        print(f"Pages written {written}, unchanged {len(results) - written}")
+
+    return [info for _, info, _ in results]
+
+
+def traverse_and_generate_html(
+    source,
+    template_path,
+    destination,
+    basepath,
+    jobs=1,
+    cache=None,
+    include_drafts=False,
+    listing_manifest_path=None,
+):
+    plan = plan_build(source, destination, template_path, include_drafts)
+    plan.create_directories()
+    pages = plan.pages
+    infos = render_pages(pages, basepath, jobs, cache)
+
+    records = [
+        (src_path, dest_path, info)
+        for (src_path, dest_path, _), info in zip(pages, infos)
+    ]
+    listing_outputs = []
+    if listing_manifest_path is not None:
+        with profiler.stage("listings"):
+            listing_outputs = generate_listings(
+                records,
+                source,
+                destination,
+                template_path,
+                basepath,
+                listing_manifest_path,
+                taken=set(plan.destinations),
+            )
+    return records, listing_outputs
+
+
+def incremental_generate_html(
+    source,
+    template_path,
+    destination,
+    basepath,
+    manifest_path,
+    jobs=1,
+    cache=None,
+    include_drafts=False,
+    explain_rebuilds=False,
+    listing_manifest_path=None,
+):
+    previous = load_manifest(manifest_path)
+    current = {}
+    template_hashes = {}
+    reasons = {}
+
+    plan = plan_build(source, destination, template_path, include_drafts)
+    pages = plan.pages
+    for src_path, dest_path, page_template in pages:
+        if page_template not in template_hashes:
+            template_hashes[page_template] = hash_file(page_template)
+
+        previous_entry = previous.get(src_path)
+        previous_images = (previous_entry or {}).get("info", {}).get("images", [])
+        entry = page_entry(
+            hash_file(src_path),
+            page_template,
+            template_hashes[page_template],
+            basepath,
+            dest_path,
+            image_stamp(previous_images),
+            highlighter_version(),
+        )
+        current[src_path] = entry
+
+        page_reasons = entry_reasons(previous_entry, entry)
+        if not page_reasons and not os.path.isfile(dest_path):
+            page_reasons.append("output missing")
+
+        if page_reasons:
+            reasons[src_path] = page_reasons
+        else:
+            entry["info"] = previous_entry["info"]
+
+    stale = [page for page in pages if page[0] in reasons]
+    plan.create_directories()
+    try:
+        infos = render_pages(stale, basepath, jobs, cache)
+        for (src_path, _, _), info in zip(stale, infos):
+            current[src_path]["info"] = info
+            current[src_path]["images"] = image_stamp(info["images"])
+    except Exception:
+        for src_path in reasons:
+            current.pop(src_path, None)
+        save_manifest(manifest_path, {**previous, **current})
+        raise
+
+    if explain_rebuilds:
+        explain(reasons, linked_pages(previous, current, destination, reasons))
+
+    removed = 0
+    outputs = {entry["output"] for entry in current.values()}
+    for src_path, entry in previous.items():
+        if src_path in current or entry["output"] in outputs:
+            continue
+
+        print(f" * removing {entry['output']} (source {src_path} is gone)")
+        remove_output(entry["output"], destination)
+        removed += 1
+
+    save_manifest(manifest_path, current)
+    unchanged = len(current) - len(reasons)
+    print(f"Rendered {len(reasons)}, unchanged {unchanged}, removed {removed}")
+
+    records = [
+        (src_path, dest_path, current[src_path]["info"])
+        for src_path, dest_path, _ in pages
+    ]
+    listing_outputs = []
+    if listing_manifest_path is not None:
+        with profiler.stage("listings"):
+            listing_outputs = generate_listings(
+                records,
+                source,
+                destination,
+                template_path,
+                basepath,
+                listing_manifest_path,
+                taken=set(plan.destinations),
+                explain_rebuilds=explain_rebuilds,
+            )
+    return records, listing_outputs
+
+
+def read_source(from_path):
     with open(from_path) as md_text:
-        md_data = md_text.read()
+        return md_text.read()
+
+
+def read_source_lines(from_path):
+    with open(from_path) as md_text:
+        for line in md_text:
+            yield line.rstrip("\n")
+
+
+def write_page(dest_path, template, basepath, title, content):
+    if isinstance(content, str):
+        with profiler.stage("template fill"):
+            html = template.render(basepath, Title=title, Content=content)
+        with profiler.stage("write"):
+            return write_output(dest_path, html)
+
+    with profiler.stage("html serialize + write"):
+        with OutputFile(dest_path) as output:
+            template.write(output, basepath, Title=title, Content=content)
+
+    return output.written
+
+
+def render_html(node):
+    with profiler.stage("html serialize"):
+        return node.to_html()
+
 
-    with open(template_path) as tmpl_text:
-        tmpl_data = tmpl_text.read()
+def render_cached_document(md_data):
+    with profiler.stage("block parse"):
+        document = parse_markdown(md_data)
+    return {
+        "html": render_html(document.node),
+        "title": document.title,
+        "headings": document.headings,
+        "word_count": document.word_count,
+        "summary": document.summary,
+        "links": document.links,
+        "images": document.images,
+        "image_stamp": image_stamp(document.images),
+    }
 
-    html_content = markdown_to_html_node(md_data).to_html()
-    title = extract_title(md_data)
 
-    final_html = (
-        tmpl_data
-        .replace("{{ Title }}", title)
-        .replace("{{ Content }}", html_content)
-        .replace('href="/', f'href="{basepath}')
-        .replace('src="/', f'src="{basepath}')
+def render_cached(cache, md_data):
+    with profiler.stage("html cache"):
+        cached = cache.get(md_data)
+    if cached is None or cached.get("image_stamp") != image_stamp(cached["images"]):
+        cached = render_cached_document(md_data)
+        cache.put(md_data, cached)
+
+    return cached
+
+
+def truncate_summary(summary, limit=SUMMARY_MAX_CHARS):
+    if len(summary) <= limit:
+        return summary
+
+    return summary[:limit].rsplit(" ", 1)[0] + "…"
+
+
+def page_info(metadata, title, summary, links, images):
+    date = metadata.get("date")
+    return {
+        "title": title,
+        "date": str(date) if date is not None else None,
+        "summary": truncate_summary(metadata.get("summary") or summary),
+        "links": internal_links(links),
+        "images": internal_links(images),
+    }
+
+
+def stream_page(from_path, template_path, dest_path, basepath):
+    template = load_template(template_path)
+
+    metadata, lines = split_front_matter_lines(read_source_lines(from_path))
+    title = metadata.get("title")
+    if not title:
+        with profiler.stage("title"):
+            title = find_block_title(lines)
+        if title is None:
+            raise Exception("No h1 title has been provided")
+        _, lines = split_front_matter_lines(read_source_lines(from_path))
+
+    links = []
+    images = []
+    content = markdown_lines_to_html_node(lines, links, images)
+
+    written = write_page(
+        dest_path, template, basepath, escape(title, quote=False), content
     )
 
-    dest_dir = os.path.dirname(dest_path)
-    if not os.path.exists(dest_dir):
-        os.makedirs(dest_dir)
+    return page_info(metadata, title, "", links, images), written
+
+
+def generate_page(from_path, template_path, dest_path, basepath, cache=None):
+    if os.path.getsize(from_path) >= STREAMING_THRESHOLD_BYTES:
+        return stream_page(from_path, template_path, dest_path, basepath)
+
+    with profiler.stage("read"):
+        md_text = read_source(from_path)
+    with profiler.stage("front matter"):
+        metadata, md_data = split_front_matter(md_text)
+    template = load_template(template_path)
+
+    if cache is None:
+        with profiler.stage("block parse"):
+            document = parse_markdown(md_data)
+        title, content = document.title, document.node
+        summary, links, images = document.summary, document.links, document.images
+    else:
+        cached = render_cached(cache, md_data)
+        title, summary = cached["title"], cached["summary"]
+        links, images = cached["links"], cached["images"]
+        content = rewrite_basepath(cached["html"], basepath)
+
+    title = metadata.get("title") or title
+    if title is None:
+        raise Exception("No h1 title has been provided")
+
+    written = write_page(
+        dest_path, template, basepath, escape(title, quote=False), content
+    )
 
-    with open(dest_path, "w") as file:
-        file.write(final_html)
+    return page_info(metadata, title, summary, links, images), written
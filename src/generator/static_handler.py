@@ -1,28 +1,212 @@
+import errno
+import json
 import os
 import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+from config import STATIC_COPY_WORKERS
+from generator.manifest import hash_file, remove_output
 
-def recursive_copy(source_folder, target_folder):
-    for item in os.listdir(source_folder):
-        src_path = os.path.join(source_folder, item)
-        dest_path = os.path.join(target_folder, item)
 
-        print(f" * {src_path} -> {dest_path}")
+def scan_tree(source):
+    directories = []
+    files = []
+    stack = [""]
 
-        if os.path.isfile(src_path):
-            shutil.copy(src_path, dest_path)
-        elif os.path.isdir(src_path):
-            os.mkdir(dest_path)
-            recursive_copy(src_path, dest_path)
+    while stack:
+        relative_dir = stack.pop()
+        with os.scandir(os.path.join(source, relative_dir)) as entries:
+            for entry in entries:
+                relative = os.path.join(relative_dir, entry.name)
+                if entry.is_dir():
+                    directories.append(relative)
+                    stack.append(relative)
+                elif entry.is_file():
+                    files.append((relative, entry.stat().st_size))
 
+    directories.sort()
+    files.sort()
+    return directories, files
 
-def copy_static_files(source, target):
+
+def copy_files(source, target, files, workers, verbose=False, link=False):
+    def copy_one(relative):
+        src_path = os.path.join(source, relative)
+        dest_path = os.path.join(target, relative)
+        copy_file(src_path, dest_path, link)
+        if verbose:
+            print(f" * {src_path} -> {dest_path}")
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for _ in executor.map(copy_one, files):
+            pass
+
+
+def print_copy_summary(copied, copied_bytes, started):
+    elapsed = time.perf_counter() - started
+    print(f"Copied {copied} file(s), {copied_bytes / 1e6:.1f} MB in {elapsed:.2f}s")
+
+
+def copy_static_files(
+    source, target, clean=True, workers=STATIC_COPY_WORKERS, verbose=False
+):
     if not os.path.isdir(source):
         raise Exception(f"No {source} folder found")
 
-    if os.path.exists(target):
+    started = time.perf_counter()
+    if clean and os.path.exists(target):
         print("Deleting public directory...")
         shutil.rmtree(target)
 
-    os.mkdir(target)
-    recursive_copy(source, target)
+    directories, files = scan_tree(source)
+    os.makedirs(target, exist_ok=True)
+    for directory in directories:
+        os.makedirs(os.path.join(target, directory), exist_ok=True)
+
+    copy_files(source, target, [relative for relative, _ in files], workers, verbose)
+    print_copy_summary(len(files), sum(size for _, size in files), started)
+    return [relative for relative, _ in files]
+
+
+def _copy_file_range(src_path, dest_path):
+    with open(src_path, "rb") as src, open(dest_path, "wb") as dest:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dest.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+
+
+def copy_file(src_path, dest_path, link=False):
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+
+    if link:
+        try:
+            os.link(src_path, dest_path)
+            return
+        except OSError as error:
+            if error.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+
+    dest_dir = os.path.dirname(dest_path) or "."
+    same_device = os.stat(src_path).st_dev == os.stat(dest_dir).st_dev
+    if same_device and hasattr(os, "copy_file_range"):
+        try:
+            _copy_file_range(src_path, dest_path)
+        except OSError as error:
+            if error.errno not in (
+                errno.EXDEV,
+                errno.ENOSYS,
+                errno.EINVAL,
+                errno.EOPNOTSUPP,
+            ):
+                raise
+            shutil.copyfile(src_path, dest_path)
+    else:
+        shutil.copyfile(src_path, dest_path)
+
+    shutil.copystat(src_path, dest_path)
+
+
+def is_unchanged(src_path, dest_path, checksum=False):
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+
+    src_stat = os.stat(src_path)
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+
+    if checksum:
+        return hash_file(src_path) == hash_file(dest_path)
+
+    return src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+
+def load_static_manifest(manifest_path):
+    try:
+        with open(manifest_path) as file:
+            return set(json.load(file))
+    except (OSError, ValueError):
+        return set()
+
+
+def save_static_manifest(manifest_path, files):
+    manifest_dir = os.path.dirname(manifest_path)
+    if manifest_dir:
+        os.makedirs(manifest_dir, exist_ok=True)
+
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(sorted(files), file, indent=2)
+
+    os.replace(tmp_path, manifest_path)
+
+
+def sync_static_files(
+    source,
+    target,
+    manifest_path,
+    checksum=False,
+    link=False,
+    workers=STATIC_COPY_WORKERS,
+    verbose=False,
+):
+    if not os.path.isdir(source):
+        raise Exception(f"No {source} folder found")
+
+    started = time.perf_counter()
+    previous = load_static_manifest(manifest_path)
+    directories, files = scan_tree(source)
+    current = {relative for relative, _ in files}
+
+    os.makedirs(target, exist_ok=True)
+    for directory in directories:
+        os.makedirs(os.path.join(target, directory), exist_ok=True)
+
+    changed = [
+        (relative, size)
+        for relative, size in files
+        if not is_unchanged(
+            os.path.join(source, relative), os.path.join(target, relative), checksum
+        )
+    ]
+    copy_files(
+        source, target, [relative for relative, _ in changed], workers, verbose, link
+    )
+
+    removed = 0
+    for relative in sorted(previous - current):
+        dest_path = os.path.join(target, relative)
+        if verbose:
+            print(f" * removing {dest_path}")
+        remove_output(dest_path, target)
+        removed += 1
+
+    save_static_manifest(manifest_path, current)
+    print_copy_summary(len(changed), sum(size for _, size in changed), started)
+    print(f"Unchanged {len(current) - len(changed)}, removed {removed} static file(s)")
+    return sorted(current)
+
+
+def remove_orphans(target, keep, verbose=False):
+    if not os.path.isdir(target):
+        return 0
+
+    _, files = scan_tree(target)
+    removed = 0
+    for relative, _ in files:
+        if relative in keep:
+            continue
+
+        dest_path = os.path.join(target, relative)
+        if verbose:
+            print(f" * removing {dest_path}")
+        remove_output(dest_path, target)
+        removed += 1
+
+    return removed
@@ -0,0 +1,97 @@
+import os
+import re
+
+from config import TEMPLATES_DIRECTORY
+from markdown.htmlnode import HTMLNode
+
+SLOT_PATTERN = re.compile(r"\{\{ (\w+) \}\}|(?:href|src)=\"/")
+BASEPATH_PATTERN = re.compile(r"((?:href|src)=\")/")
+BASEPATH_SLOT = None
+
+_template_cache = {}
+
+
+class Template:
+    def __init__(self, text):
+        self.literals = []
+        self.slots = []
+
+        position = 0
+        for match in SLOT_PATTERN.finditer(text):
+            if match.group(1):
+                self.literals.append(text[position : match.start()])
+                self.slots.append((match.group(1), match.group(0)))
+            else:
+                self.literals.append(text[position : match.end() - 1])
+                self.slots.append((BASEPATH_SLOT, "/"))
+            position = match.end()
+
+        self.literals.append(text[position:])
+
+    def render(self, basepath, **values):
+        parts = [self.literals[0]]
+
+        for (name, original), literal in zip(self.slots, self.literals[1:]):
+            if name is BASEPATH_SLOT:
+                parts.append(basepath)
+            else:
+                parts.append(values.get(name, original))
+            parts.append(literal)
+
+        return "".join(parts)
+
+    def write(self, out, basepath, **values):
+        write = out.write
+        if basepath == "/":
+            write_content = write
+        else:
+            write_content = lambda fragment: write(rewrite_basepath(fragment, basepath))
+
+        write(self.literals[0])
+        for (name, original), literal in zip(self.slots, self.literals[1:]):
+            value = basepath if name is BASEPATH_SLOT else values.get(name, original)
+
+            if isinstance(value, HTMLNode):
+                value.emit(write_content)
+            else:
+                write(value)
+            write(literal)
+
+
+def rewrite_basepath(html, basepath):
+    if basepath == "/":
+        return html
+
+    return BASEPATH_PATTERN.sub(lambda match: match.group(1) + basepath, html)
+
+
+def load_template(path):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _template_cache.get(path)
+
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path) as tmpl_text:
+        template = Template(tmpl_text.read())
+
+    _template_cache[path] = (mtime, template)
+    return template
+
+
+def resolve_template(src_path, content_root, default_path, name=None):
+    if name:
+        candidate = os.path.join(TEMPLATES_DIRECTORY, name + ".html")
+        if not os.path.isfile(candidate):
+            raise Exception(f"Template {candidate} requested by {src_path} not found")
+        return candidate
+
+    relative = os.path.relpath(src_path, content_root)
+    section, sep, _ = relative.partition(os.sep)
+
+    if sep:
+        candidate = os.path.join(TEMPLATES_DIRECTORY, section + ".html")
+        if os.path.isfile(candidate):
+            return candidate
+
+    return default_path
@@ -0,0 +1,199 @@
+import os
+import time
+
+from generator.manifest import remove_output
+from generator.static_handler import copy_file
+from generator.listing import generate_listings
+from markdown.images import publish_images
+from generator.page_generator import (
+    BuildPlan,
+    plan_build,
+    page_destination,
+    render_pages,
+)
+
+
+def snapshot(paths):
+    state = {}
+
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+            continue
+
+        for root, _, files in os.walk(path):
+            for name in files:
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                state[file_path] = (stat.st_mtime_ns, stat.st_size)
+
+    return state
+
+
+def diff_snapshots(before, after):
+    changed = {path for path, stamp in after.items() if before.get(path) != stamp}
+    removed = set(before) - set(after)
+
+    return changed, removed
+
+
+def is_within(path, directory):
+    return os.path.commonpath([os.path.abspath(path), os.path.abspath(directory)]) == (
+        os.path.abspath(directory)
+    )
+
+
+def wait_for_quiet(paths, state, debounce):
+    while True:
+        time.sleep(debounce)
+        latest = snapshot(paths)
+        if latest == state:
+            return state
+        state = latest
+
+
+class SiteWatcher:
+    def __init__(
+        self,
+        source,
+        static_dir,
+        template_path,
+        templates_dir,
+        destination,
+        basepath,
+        cache=None,
+        include_drafts=False,
+        records=(),
+        listing_manifest_path=None,
+    ):
+        self.source = source
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.templates_dir = templates_dir
+        self.destination = destination
+        self.basepath = basepath
+        self.cache = cache
+        self.include_drafts = include_drafts
+        self.infos = {src_path: info for src_path, _, info in records}
+        self.listing_manifest_path = listing_manifest_path
+        self.paths = [source, static_dir, template_path, templates_dir]
+
+    def sync_static(self, changed, removed):
+        for path in sorted(changed):
+            target = os.path.join(
+                self.destination, os.path.relpath(path, self.static_dir)
+            )
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            copy_file(path, target)
+            print(f" * {path} -> {target}")
+
+        for path in sorted(removed):
+            target = os.path.join(
+                self.destination, os.path.relpath(path, self.static_dir)
+            )
+            print(f" * removing {target}")
+            remove_output(target, self.destination)
+
+    def image_dependents(self, static_paths):
+        urls = {
+            "/" + os.path.relpath(path, self.static_dir).replace(os.sep, "/")
+            for path in static_paths
+        }
+
+        return {
+            src_path
+            for src_path, info in self.infos.items()
+            if urls.intersection(info["images"])
+        }
+
+    def affected_pages(self, changed_pages, changed_templates, rebuild_all=False):
+        plan = plan_build(
+            self.source, self.destination, self.template_path, self.include_drafts
+        )
+
+        return [
+            page
+            for page in plan.pages
+            if rebuild_all or page[0] in changed_pages or page[2] in changed_templates
+        ]
+
+    def rebuild(self, changed, removed):
+        static_changed = {p for p in changed if is_within(p, self.static_dir)}
+        static_removed = {p for p in removed if is_within(p, self.static_dir)}
+        pages_changed = {p for p in changed if is_within(p, self.source)}
+        pages_removed = {p for p in removed if is_within(p, self.source)}
+        templates_changed = changed - static_changed - pages_changed
+        templates_removed = removed - static_removed - pages_removed
+
+        self.sync_static(static_changed, static_removed)
+        pages_changed |= self.image_dependents(static_changed | static_removed)
+
+        for path in sorted(pages_removed):
+            dest_path = page_destination(path, self.source, self.destination)
+            print(f" * removing {dest_path} (source {path} is gone)")
+            remove_output(dest_path, self.destination)
+            self.infos.pop(path, None)
+
+        if pages_changed or templates_changed or templates_removed:
+            pages = self.affected_pages(
+                pages_changed, templates_changed, rebuild_all=bool(templates_removed)
+            )
+            BuildPlan(pages).create_directories()
+            infos = render_pages(pages, self.basepath, cache=self.cache)
+            for (src_path, _, _), info in zip(pages, infos):
+                self.infos[src_path] = info
+            publish_images(src for info in infos for src in info["images"])
+
+        if pages_changed or pages_removed or templates_changed or templates_removed:
+            self.update_listings()
+
+    def update_listings(self):
+        if self.listing_manifest_path is None:
+            return
+
+        plan = plan_build(
+            self.source, self.destination, self.template_path, self.include_drafts
+        )
+        records = [
+            (src_path, dest_path, self.infos[src_path])
+            for src_path, dest_path, _ in plan.pages
+            if src_path in self.infos
+        ]
+        generate_listings(
+            records,
+            self.source,
+            self.destination,
+            self.template_path,
+            self.basepath,
+            self.listing_manifest_path,
+            taken=set(plan.destinations),
+        )
+
+    def run(self, interval=0.5, debounce=0.2):
+        state = snapshot(self.paths)
+        print(f"Watching {', '.join(self.paths)} for changes (Ctrl+C to stop)...")
+
+        while True:
+            time.sleep(interval)
+            latest = snapshot(self.paths)
+            if latest == state:
+                continue
+
+            latest = wait_for_quiet(self.paths, latest, debounce)
+            started = time.perf_counter()
+            changed, removed = diff_snapshots(state, latest)
+            state = latest
+
+            try:
+                self.rebuild(changed, removed)
+            except Exception as error:
+                print(f"Rebuild failed: {error}")
+                continue
+
+            elapsed = (time.perf_counter() - started) * 1000
+            count = len(changed) + len(removed)
+            print(f"Rebuilt {count} change(s) in {elapsed:.1f} ms")
@@ -1,27 +1,274 @@
+import argparse
+import os
 import sys
 
-from generator.static_handler import copy_static_files
-from generator.page_generator import traverse_and_generate_html
+import profiler
+from generator.static_handler import (
+    copy_static_files,
+    remove_orphans,
+    sync_static_files,
+)
+from generator.html_cache import HTMLCache
+from generator.highlight_cache import CachedHighlighter
+from generator.images import ImagePipeline
+from generator.output_writer import write_output
+from markdown.highlight import (
+    PygmentsHighlighter,
+    pygments,
+    get_highlighter,
+    set_highlighter,
+    highlighter_version,
+)
+from markdown.images import (
+    set_image_processor,
+    image_processor_version,
+    publish_images,
+)
+from generator.watcher import SiteWatcher
+from generator.link_checker import check_links
+from generator.page_generator import (
+    traverse_and_generate_html,
+    incremental_generate_html,
+)
 from config import (
     STATIC_FILES_DIRECTORY,
     INPUT_CONTENT_DIRECTORY,
     TEMPLATE_FILE_PATH,
     OUTPUT_DIRECTORY,
+    MANIFEST_FILE_PATH,
+    STATIC_MANIFEST_FILE_PATH,
+    HTML_CACHE_DIRECTORY,
+    HIGHLIGHT_CACHE_DIRECTORY,
+    HIGHLIGHT_STYLESHEET,
+    PARSER_VERSION,
+    TEMPLATES_DIRECTORY,
+    PROFILE_REPORT_PATH,
+    LISTING_MANIFEST_FILE_PATH,
 )
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the static site.")
+    parser.add_argument(
+        "basepath", nargs="?", default="/", help="URL prefix for site links"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-render changed pages and re-copy changed static files",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="delete the output directory and copy every static file again",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="print every static file as it is copied",
+    )
+    parser.add_argument(
+        "--checksum-static",
+        action="store_true",
+        help="compare static files by content hash instead of size and mtime",
+    )
+    parser.add_argument(
+        "--link-static",
+        action="store_true",
+        help="hardlink static files into the output directory when possible",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes used to render pages",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="parse every page instead of reusing cached HTML",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=HTML_CACHE_DIRECTORY,
+        help=f"directory of the rendered HTML cache (default: {HTML_CACHE_DIRECTORY})",
+    )
+    parser.add_argument(
+        "--highlight",
+        action="store_true",
+        help="highlight fenced code blocks with Pygments and write its styles "
+        f"to /{HIGHLIGHT_STYLESHEET} (link it from the template)",
+    )
+    parser.add_argument(
+        "--responsive-images",
+        action="store_true",
+        help="add width, height and resized srcset variants to local images",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_REPORT_PATH,
+        metavar="REPORT",
+        help=f"record per-stage and per-page timings (default: {PROFILE_REPORT_PATH})",
+    )
+    parser.add_argument(
+        "--drafts",
+        action="store_true",
+        help="also render pages marked 'draft: true' in their front matter",
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="with --incremental, print why each page was rebuilt",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and rebuild only what changed after each edit",
+    )
+    parser.add_argument(
+        "--check-links",
+        action="store_true",
+        help="report internal links and images that point to no generated file",
+    )
+
+    return parser.parse_args()
+
+
+def copy_static(args):
+    if not args.clean:
+        print("Syncing static files...")
+        return sync_static_files(
+            STATIC_FILES_DIRECTORY,
+            OUTPUT_DIRECTORY,
+            STATIC_MANIFEST_FILE_PATH,
+            checksum=args.checksum_static,
+            link=args.link_static,
+            verbose=args.verbose,
+        )
+    else:
+        print("Copying static files...")
+        return copy_static_files(
+            STATIC_FILES_DIRECTORY, OUTPUT_DIRECTORY, verbose=args.verbose
+        )
+
+
 def main():
-    basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
+    args = parse_args()
+    basepath = args.basepath
+    stylesheet = None
+    if args.highlight:
+        if pygments is None:
+            print("Pygments is not installed; code blocks will not be highlighted.")
+        else:
+            highlighter = PygmentsHighlighter()
+            stylesheet = highlighter.stylesheet()
+            if not args.no_cache:
+                highlighter = CachedHighlighter(highlighter, HIGHLIGHT_CACHE_DIRECTORY)
+            set_highlighter(highlighter)
+
+    if args.responsive_images:
+        set_image_processor(ImagePipeline(STATIC_FILES_DIRECTORY, OUTPUT_DIRECTORY))
+
+    cache = None
+    if not args.no_cache:
+        version = ":".join(
+            (PARSER_VERSION, highlighter_version(), image_processor_version())
+        )
+        cache = HTMLCache(args.cache_dir, version=version)
 
-    print("Copying static files...")
-    copy_static_files(STATIC_FILES_DIRECTORY, OUTPUT_DIRECTORY)
+    if args.profile:
+        if args.jobs > 1:
+            print("Profiling renders pages serially; ignoring --jobs.")
+            args.jobs = 1
+        profiler.enable()
+
+    with profiler.stage("static copy"):
+        static_files = copy_static(args)
+        if stylesheet is not None:
+            stylesheet_path = os.path.join(OUTPUT_DIRECTORY, HIGHLIGHT_STYLESHEET)
+            write_output(stylesheet_path, stylesheet)
+            static_files.append(HIGHLIGHT_STYLESHEET)
 
     print(
         f"Generating pages from '/{INPUT_CONTENT_DIRECTORY}' to '/{OUTPUT_DIRECTORY}' using {TEMPLATE_FILE_PATH}:"
     )
-    traverse_and_generate_html(
-        INPUT_CONTENT_DIRECTORY, TEMPLATE_FILE_PATH, OUTPUT_DIRECTORY, basepath
-    )
+    if args.incremental:
+        records, listing_outputs = incremental_generate_html(
+            INPUT_CONTENT_DIRECTORY,
+            TEMPLATE_FILE_PATH,
+            OUTPUT_DIRECTORY,
+            basepath,
+            MANIFEST_FILE_PATH,
+            args.jobs,
+            cache,
+            args.drafts,
+            args.explain,
+            LISTING_MANIFEST_FILE_PATH,
+        )
+    else:
+        records, listing_outputs = traverse_and_generate_html(
+            INPUT_CONTENT_DIRECTORY,
+            TEMPLATE_FILE_PATH,
+            OUTPUT_DIRECTORY,
+            basepath,
+            args.jobs,
+            cache,
+            args.drafts,
+            LISTING_MANIFEST_FILE_PATH,
+        )
+
+    with profiler.stage("image variants"):
+        variants = publish_images(
+            src for _, _, info in records for src in info["images"]
+        )
+
+    if not args.incremental:
+        outputs = [dest_path for _, dest_path, _ in records] + listing_outputs
+        keep = set(static_files) | set(variants)
+        keep.update(os.path.relpath(output, OUTPUT_DIRECTORY) for output in outputs)
+        removed = remove_orphans(OUTPUT_DIRECTORY, keep, args.verbose)
+        print(f"Removed {removed} orphaned output file(s)")
+
+    if cache is not None:
+        cache.prune()
+    if isinstance(get_highlighter(), CachedHighlighter):
+        get_highlighter().cache.prune()
+
+    dangling = []
+    if args.check_links:
+        print("Checking links...")
+        with profiler.stage("link check"):
+            dangling = check_links(
+                records, listing_outputs, OUTPUT_DIRECTORY, STATIC_FILES_DIRECTORY
+            )
+
+    if args.profile:
+        profiler.write_report(args.profile)
+
+    if dangling and not args.watch:
+        sys.exit(1)
+
+    if args.watch:
+        watcher = SiteWatcher(
+            INPUT_CONTENT_DIRECTORY,
+            STATIC_FILES_DIRECTORY,
+            TEMPLATE_FILE_PATH,
+            TEMPLATES_DIRECTORY,
+            OUTPUT_DIRECTORY,
+            basepath,
+            cache,
+            args.drafts,
+            records,
+            LISTING_MANIFEST_FILE_PATH,
+        )
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            print("Stopped watching.")
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
 from enum import Enum
+from html import escape, unescape
 
-from markdown.htmlnode import ParentNode
-from markdown.textnode import TextNode, TextType
+import profiler
+from markdown.htmlnode import LeafNode, ParentNode, StreamNode
 from markdown.inline_markdown import text_to_textnodes
 from markdown.textnode import text_node_to_html_node
+from markdown.highlight import highlight_code
 
 
 class BlockType(Enum):
@@ -15,53 +17,216 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 
+class ParsedDocument:
+    def __init__(
+        self,
+        node,
+        title=None,
+        headings=None,
+        word_count=0,
+        summary="",
+        links=None,
+        images=None,
+    ):
+        self.node = node
+        self.title = title
+        self.headings = headings if headings is not None else []
+        self.word_count = word_count
+        self.summary = summary
+        self.links = links if links is not None else []
+        self.images = images if images is not None else []
+
+    def __repr__(self):
+        return f"ParsedDocument({self.title}, {self.headings}, {self.word_count})"
+
+
+HEADING_PREFIXES = ("# ", "## ", "### ", "#### ", "##### ", "###### ")
+CODE_FENCE = "```"
+
+
+def is_fence_opening(line):
+    return line.startswith(CODE_FENCE) and "`" not in line[len(CODE_FENCE) :]
+
+
+def classify_block(lines):
+    first = lines[0]
+
+    if first.startswith(HEADING_PREFIXES):
+        return BlockType.HEADING
+
+    if first.startswith(">"):
+        if all(line.startswith(">") for line in lines if line.strip()):
+            return BlockType.QUOTE
+
+    elif first.startswith("- "):
+        if all(line.startswith("- ") for line in lines if line.strip()):
+            return BlockType.UNORDERED_LIST
+
+    elif first.startswith("1. "):
+        if all(line.startswith(f"{idx}. ") for idx, line in enumerate(lines, 1)):
+            return BlockType.ORDERED_LIST
+
+    return BlockType.PARAGRAPH
+
+
+def iter_blocks(markdown):
+    return iter_line_blocks(markdown.split("\n"))
+
+
+def finish_block(lines):
+    while not lines[-1].strip():
+        lines.pop()
+    lines[-1] = lines[-1].rstrip()
+
+    return classify_block(lines), lines
+
+
+def iter_line_blocks(markdown_lines):
+    lines = []
+    fenced = False
+
+    for line in markdown_lines:
+        if fenced:
+            lines.append(line)
+            if line.strip().startswith(CODE_FENCE):
+                yield BlockType.CODE, lines
+                lines = []
+                fenced = False
+            continue
+
+        if not line:
+            if lines:
+                yield finish_block(lines)
+                lines = []
+            continue
+
+        if not lines:
+            if not line.strip():
+                continue
+            line = line.lstrip()
+            fenced = is_fence_opening(line)
+
+        lines.append(line)
+
+    if fenced:
+        yield BlockType.CODE, lines
+    elif lines:
+        yield finish_block(lines)
+
+
 def markdown_to_blocks(markdown):
-    blocks = (block.strip() for block in markdown.split("\n\n"))
-    return [block for block in blocks if block]
+    return ["\n".join(lines) for _, lines in iter_blocks(markdown)]
 
 
 def block_to_block_type(markdown_block):
     lines = markdown_block.strip().split("\n")
 
-    if markdown_block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
-        return BlockType.HEADING
-
-    if len(lines) > 1 and lines[0].startswith("```") and lines[-1].startswith("```"):
+    if (
+        len(lines) > 1
+        and lines[0].startswith(CODE_FENCE)
+        and lines[-1].startswith(CODE_FENCE)
+    ):
         return BlockType.CODE
 
-    if all(line.startswith(">") for line in lines if line.strip()):
-        return BlockType.QUOTE
+    return classify_block(lines)
 
-    if all(line.startswith("- ") for line in lines if line.strip()):
-        return BlockType.UNORDERED_LIST
 
-    for idx, line in enumerate(lines):
-        if not line.startswith(f"{idx+1}. "):
-            break
-    else:
-        return BlockType.ORDERED_LIST
-
-    return BlockType.PARAGRAPH
+def iter_html_blocks(markdown_lines, links=None, images=None):
+    for block_type, lines in iter_line_blocks(markdown_lines):
+        with profiler.stage("block parse"):
+            block_node = block_lines_to_html_node(lines, block_type)
+        if block_type != BlockType.CODE and (links is not None or images is not None):
+            node_text(block_node, links, images)
+        yield block_node
 
 
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    converted_block_nodes = []
-
-    for markdown_block in blocks:
-        block_type = block_to_block_type(markdown_block)
-        block_html_node = block_to_html_node(markdown_block, block_type)
-        converted_block_nodes.append(block_html_node)
+    converted_block_nodes = list(iter_html_blocks(markdown.split("\n")))
 
     return ParentNode("div", converted_block_nodes, None)
 
 
+def markdown_lines_to_html_node(markdown_lines, links=None, images=None):
+    return StreamNode("div", iter_html_blocks(markdown_lines, links, images), None)
+
+
+def raw_value(value):
+    if "&" in value:
+        return unescape(value)
+
+    return value
+
+
+def node_text(node, links=None, images=None):
+    if isinstance(node, LeafNode):
+        if links is not None and node.tag == "a":
+            links.append(raw_value(node.props["href"]))
+        elif images is not None and node.tag == "img":
+            images.append(raw_value(node.props["src"]))
+        return raw_value(node.value or "")
+
+    return "".join(node_text(child, links, images) for child in node.children)
+
+
+def find_block_title(markdown_lines):
+    for block_type, lines in iter_line_blocks(markdown_lines):
+        if block_type == BlockType.HEADING and lines[0].startswith("# "):
+            return node_text(heading_to_html_node(lines)).strip()
+
+    return None
+
+
+def parse_markdown(markdown):
+    block_nodes = []
+    title = None
+    headings = []
+    word_count = 0
+    summary = ""
+    links = []
+    images = []
+
+    for block_type, lines in iter_line_blocks(markdown.split("\n")):
+        block_node = block_lines_to_html_node(lines, block_type)
+        block_nodes.append(block_node)
+
+        if block_type == BlockType.CODE:
+            continue
+
+        text = node_text(block_node, links, images)
+        word_count += len(text.split())
+
+        if block_type == BlockType.PARAGRAPH and not summary:
+            if any(
+                child.tag is None and child.value.strip()
+                for child in block_node.children
+            ):
+                summary = text.strip()
+
+        if block_type == BlockType.HEADING:
+            level = int(block_node.tag[1:])
+            headings.append((level, text.strip()))
+            if level == 1 and title is None:
+                title = text.strip()
+
+    return ParsedDocument(
+        ParentNode("div", block_nodes, None),
+        title,
+        headings,
+        word_count,
+        summary,
+        links,
+        images,
+    )
+
+
 def text_to_children(block):
-    text_nodes = text_to_textnodes(block)
-    return list(map(text_node_to_html_node, text_nodes))
+    with profiler.stage("inline parse"):
+        text_nodes = text_to_textnodes(escape(block, quote=False))
+    return [text_node_to_html_node(node, safe=True) for node in text_nodes]
 
 
-def heading_to_html_node(block):
+def heading_to_html_node(lines):
+    block = "\n".join(lines)
     level = 0
     for char in block:
         if char == "#":
@@ -78,20 +243,30 @@ def heading_to_html_node(block):
     return ParentNode(f"h{level}", children)
 
 
-def code_to_html_node(block):
-    if not block.startswith("```") or not block.endswith("```"):
+def fence_language(line):
+    info = line[len(CODE_FENCE) :].split()
+    return info[0] if info else None
+
+
+def code_to_html_node(lines):
+    if not lines[0].startswith(CODE_FENCE):
         raise ValueError("invalid code block")
 
-    text = block[4:-3]
-    raw_text_node = TextNode(text, TextType.TEXT)
-    child = text_node_to_html_node(raw_text_node)
-    code = ParentNode("code", [child])
+    language = fence_language(lines[0])
+
+    if len(lines) > 1 and lines[-1].strip().startswith(CODE_FENCE):
+        code_lines = lines[1:-1]
+    else:
+        code_lines = lines[1:]
+
+    html = highlight_code("".join(line + "\n" for line in code_lines), language)
+    props = {"class": f"language-{language}"} if language else None
+    code = ParentNode("code", [LeafNode(None, html, safe=True)], props)
 
     return ParentNode("pre", [code])
 
 
-def quote_to_html_node(block):
-    lines = block.split("\n")
+def quote_to_html_node(lines):
     new_lines = []
 
     for line in lines:
@@ -106,11 +281,10 @@ def quote_to_html_node(block):
     return ParentNode("blockquote", children)
 
 
-def ulist_to_html_node(block):
-    items = block.split("\n")
+def ulist_to_html_node(lines):
     html_items = []
 
-    for item in items:
+    for item in lines:
         text = item[2:]
         children = text_to_children(text)
         html_items.append(ParentNode("li", children))
@@ -118,20 +292,18 @@ def ulist_to_html_node(block):
     return ParentNode("ul", html_items)
 
 
-def olist_to_html_node(block):
-    items = block.split("\n")
+def olist_to_html_node(lines):
     html_items = []
 
-    for item in items:
-        text = item[3:]
+    for idx, item in enumerate(lines, 1):
+        text = item[len(f"{idx}. ") :]
         children = text_to_children(text)
         html_items.append(ParentNode("li", children))
 
     return ParentNode("ol", html_items)
 
 
-def paragraph_to_html_node(block):
-    lines = block.split("\n")
+def paragraph_to_html_node(lines):
     paragraph = " ".join(lines)
     children = text_to_children(paragraph)
 
@@ -139,24 +311,28 @@ def paragraph_to_html_node(block):
 
 
 def block_to_html_node(block, block_type):
+    return block_lines_to_html_node(block.split("\n"), block_type)
+
+
+def block_lines_to_html_node(lines, block_type):
     match block_type:
         case BlockType.HEADING:
-            return heading_to_html_node(block)
+            return heading_to_html_node(lines)
 
         case BlockType.CODE:
-            return code_to_html_node(block)
+            return code_to_html_node(lines)
 
         case BlockType.QUOTE:
-            return quote_to_html_node(block)
+            return quote_to_html_node(lines)
 
         case BlockType.UNORDERED_LIST:
-            return ulist_to_html_node(block)
+            return ulist_to_html_node(lines)
 
         case BlockType.ORDERED_LIST:
-            return olist_to_html_node(block)
+            return olist_to_html_node(lines)
 
         case BlockType.PARAGRAPH:
-            return paragraph_to_html_node(block)
+            return paragraph_to_html_node(lines)
 
         case _:
             raise ValueError("invalid block type")
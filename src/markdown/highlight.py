@@ -0,0 +1,55 @@
+from html import escape
+
+try:
+    import pygments
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+except ImportError:
+    pygments = None
+
+
+class PygmentsHighlighter:
+    def __init__(self):
+        self.version = f"pygments-{pygments.__version__}"
+        self.formatter = HtmlFormatter(nowrap=True)
+
+    def __call__(self, code, language):
+        try:
+            lexer = get_lexer_by_name(language)
+        except ClassNotFound:
+            return None
+
+        return highlight(code, lexer, self.formatter)
+
+    def stylesheet(self):
+        return "\n".join(self.formatter.get_token_style_defs("pre code")) + "\n"
+
+
+_highlighter = None
+
+
+def get_highlighter():
+    return _highlighter
+
+
+def set_highlighter(highlighter):
+    global _highlighter
+    _highlighter = highlighter
+
+
+def highlighter_version():
+    if _highlighter is None:
+        return "none"
+
+    return _highlighter.version
+
+
+def highlight_code(code, language):
+    if language and _highlighter is not None:
+        html = _highlighter(code, language)
+        if html is not None:
+            return html
+
+    return escape(code, quote=False)
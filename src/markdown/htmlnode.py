@@ -1,4 +1,27 @@
+from html import escape
+
+
+def escape_attribute(value):
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        return escape(value)
+
+    return value
+
+
+def quote_attribute(value):
+    if '"' in value:
+        return value.replace('"', "&quot;")
+
+    return value
+
+
+def escape_props(props):
+    return {name: escape_attribute(value) for name, value in props.items()}
+
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -8,11 +31,22 @@ class HTMLNode:
     def __repr__(self):
         return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
 
-    def to_html(self):
+    def emit(self, write):
         raise NotImplementedError()
 
+    def write_html(self, out):
+        self.emit(out.write)
+
+    def iter_html(self):
+        raise NotImplementedError()
+
+    def to_html(self):
+        fragments = []
+        self.emit(fragments.append)
+        return "".join(fragments)
+
     def props_to_html(self):
-        if self.props == None or self.props == {}:
+        if not self.props:
             return ""
 
         html_props = " ".join(
@@ -24,39 +58,95 @@ class HTMLNode:
 
 
 class LeafNode(HTMLNode):
-    def __init__(self, tag, value, props=None):
+    __slots__ = ()
+
+    def __init__(self, tag, value, props=None, safe=False):
+        if not safe:
+            if value and ("&" in value or "<" in value or ">" in value):
+                value = escape(value, quote=False)
+            if props:
+                props = escape_props(props)
         super().__init__(tag, value, None, props)
 
     def __repr__(self):
         return f"LeafNode({self.tag}, {self.value}, {self.props})"
 
-    def to_html(self):
+    def emit(self, write):
         if self.value is None:
             raise ValueError("Invalid HTML: no value")
         elif self.tag is None:
-            return f"{self.value}"
+            write(self.value)
         else:
-            return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            write(f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>")
+
+    def iter_html(self):
+        yield self.to_html()
 
 
 class ParentNode(HTMLNode):
-    def __init__(self, tag, children, props=None):
+    __slots__ = ()
+
+    def __init__(self, tag, children, props=None, safe=False):
+        if props and not safe:
+            props = escape_props(props)
         super().__init__(tag, None, children, props)
 
     def __repr__(self):
         return f"ParentNode({self.tag}, {self.children}, {self.props})"
 
     def traverse_children(self):
-        result = ""
+        fragments = []
         for node in self.children:
-            result += node.to_html()
+            node.emit(fragments.append)
 
-        return result
+        return "".join(fragments)
 
-    def to_html(self):
+    def emit(self, write):
         if self.tag is None:
             raise ValueError("Invalid HTML: no tag")
         elif self.children is None:
             raise ValueError("Invaild HMTL: no children passed")
-        else:
-            return f"<{self.tag}{self.props_to_html()}>{self.traverse_children()}</{self.tag}>"
+
+        write(f"<{self.tag}{self.props_to_html()}>")
+        for node in self.children:
+            node.emit(write)
+        write(f"</{self.tag}>")
+
+    def iter_html(self):
+        if self.tag is None:
+            raise ValueError("Invalid HTML: no tag")
+        elif self.children is None:
+            raise ValueError("Invaild HMTL: no children passed")
+
+        yield f"<{self.tag}{self.props_to_html()}>"
+        for node in self.children:
+            yield from node.iter_html()
+        yield f"</{self.tag}>"
+
+
+class StreamNode(ParentNode):
+    __slots__ = ("consumed",)
+
+    def __init__(self, tag, children, props=None, safe=False):
+        super().__init__(tag, children, props, safe)
+        self.consumed = False
+
+    def __repr__(self):
+        return f"StreamNode({self.tag}, <stream>, {self.props})"
+
+    def consume(self):
+        if self.consumed:
+            raise ValueError("StreamNode children can only be rendered once")
+        self.consumed = True
+
+    def traverse_children(self):
+        self.consume()
+        return super().traverse_children()
+
+    def emit(self, write):
+        self.consume()
+        super().emit(write)
+
+    def iter_html(self):
+        self.consume()
+        yield from super().iter_html()
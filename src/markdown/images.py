@@ -0,0 +1,39 @@
+_image_processor = None
+
+
+def get_image_processor():
+    return _image_processor
+
+
+def set_image_processor(image_processor):
+    global _image_processor
+    _image_processor = image_processor
+
+
+def image_processor_version():
+    if _image_processor is None:
+        return "none"
+
+    return _image_processor.version
+
+
+def image_stamp(srcs):
+    if _image_processor is None:
+        return "none"
+
+    return _image_processor.stamp(srcs)
+
+
+def publish_images(srcs):
+    if _image_processor is None:
+        return []
+
+    return _image_processor.publish(srcs)
+
+
+def image_props(src, alt):
+    props = {"src": src, "alt": alt}
+    if _image_processor is not None:
+        props.update(_image_processor(src) or {})
+
+    return props
@@ -2,6 +2,20 @@ import re
 
 from markdown.textnode import TextNode, TextType
 
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+MEDIA_TARGET = r"((?:[^\[\]_`*]|\*(?!\*))*)\]\(((?:[^\(\)_`*]|\*(?!\*))*)\)"
+INLINE_TOKEN_PATTERN = re.compile(
+    r"\*\*(.*?)\*\*"
+    r"|_((?:[^_*]|\*(?!\*))*)_"
+    r"|`((?:[^`_*]|\*(?!\*))*)`"
+    rf"|!\[{MEDIA_TARGET}"
+    rf"|\[{MEDIA_TARGET}"
+    r"|\*\*|_|`",
+    re.DOTALL,
+)
+INLINE_SPAN_TYPES = (TextType.BOLD, TextType.ITALIC, TextType.CODE)
+
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
@@ -34,17 +48,19 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
 
 
 def extract_markdown_images(text):
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    return re.findall(pattern, text)
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text):
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    return re.findall(pattern, text)
+    return LINK_PATTERN.findall(text)
 
 
 def extract_title(markdown):
-    for block_markdown in markdown.split("\n"):
+    return find_title(markdown.split("\n"))
+
+
+def find_title(markdown_lines):
+    for block_markdown in markdown_lines:
         if block_markdown.startswith("#") and len(block_markdown.split(" ", 1)[0]) == 1:
             return block_markdown[2:].strip()
 
@@ -52,6 +68,13 @@ def extract_title(markdown):
 
 
 def partition_nodes_by_media(old_nodes, media_asset_type):
+    if media_asset_type == TextType.IMAGE:
+        pattern = IMAGE_PATTERN
+    elif media_asset_type == TextType.LINK:
+        pattern = LINK_PATTERN
+    else:
+        raise ValueError("Invalid asset type: non image or link")
+
     new_nodes = []
 
     for node in old_nodes:
@@ -60,55 +83,61 @@ def partition_nodes_by_media(old_nodes, media_asset_type):
             continue
 
         text_content = node.text
+        position = 0
 
-        if media_asset_type == TextType.IMAGE:
-            asset_list = extract_markdown_images(text_content)
-        elif media_asset_type == TextType.LINK:
-            asset_list = extract_markdown_links(text_content)
-        else:
-            raise ValueError("Invalid asset type: non image or link")
+        for match in pattern.finditer(text_content):
+            if match.start() > position:
+                new_nodes.append(
+                    TextNode(text_content[position : match.start()], TextType.TEXT)
+                )
 
-        if len(asset_list) == 0:
+            new_nodes.append(TextNode(match.group(1), media_asset_type, match.group(2)))
+            position = match.end()
+
+        if position == 0:
             new_nodes.append(node)
-            continue
+        elif position < len(text_content):
+            new_nodes.append(TextNode(text_content[position:], TextType.TEXT))
 
-        for asset_node in asset_list:
-            alt_text = asset_node[0]
-            link = asset_node[1]
+    return new_nodes
 
-            if media_asset_type == TextType.IMAGE:
-                delimiter = f"![{alt_text}]({link})"
-            elif media_asset_type == TextType.LINK:
-                delimiter = f"[{alt_text}]({link})"
 
-            sections = text_content.split(delimiter, 1)
+def split_nodes_image(old_nodes):
+    return partition_nodes_by_media(old_nodes, TextType.IMAGE)
 
-            if len(sections[0]) != 0:
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
 
-            new_nodes.append(TextNode(alt_text, media_asset_type, link))
-            text_content = sections[1]
+def split_nodes_link(old_nodes):
+    return partition_nodes_by_media(old_nodes, TextType.LINK)
 
-        if len(text_content) != 0:
-            new_nodes.append(TextNode(text_content, TextType.TEXT))
 
-    return new_nodes
+def tokenize_inline(text, nodes):
+    position = 0
 
+    for match in INLINE_TOKEN_PATTERN.finditer(text):
+        start = match.start()
+        if start > position:
+            nodes.append(TextNode(text[position:start], TextType.TEXT))
+        position = match.end()
 
-def split_nodes_image(old_nodes):
-    return partition_nodes_by_media(old_nodes, TextType.IMAGE)
+        group = match.lastindex
+        if group is None:
+            raise ValueError("Invalid markdown: delimiter was not closed")
 
+        if group <= len(INLINE_SPAN_TYPES):
+            if match.group(group):
+                text_type = INLINE_SPAN_TYPES[group - 1]
+                nodes.append(TextNode(match.group(group), text_type))
+        elif group == 5:
+            nodes.append(TextNode(match.group(4), TextType.IMAGE, match.group(5)))
+        else:
+            nodes.append(TextNode(match.group(6), TextType.LINK, match.group(7)))
 
-def split_nodes_link(old_nodes):
-    return partition_nodes_by_media(old_nodes, TextType.LINK)
+    if position < len(text):
+        nodes.append(TextNode(text[position:], TextType.TEXT))
 
 
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    nodes = []
+    tokenize_inline(text, nodes)
 
     return nodes
@@ -1,5 +1,6 @@
 from enum import Enum
-from markdown.htmlnode import LeafNode
+from markdown.htmlnode import LeafNode, quote_attribute
+from markdown.images import image_props
 
 
 class TextType(Enum):
@@ -12,6 +13,8 @@ class TextType(Enum):
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -31,19 +34,23 @@ class TextNode:
         return f"TextNode({self.text}, {self.text_type.value}, {self.url})"
 
 
-def text_node_to_html_node(text_node):
+def text_node_to_html_node(text_node, safe=False):
     match text_node.text_type:
         case TextType.TEXT:
-            return LeafNode(None, text_node.text)
+            return LeafNode(None, text_node.text, safe=safe)
         case TextType.BOLD:
-            return LeafNode("b", text_node.text)
+            return LeafNode("b", text_node.text, safe=safe)
         case TextType.ITALIC:
-            return LeafNode("i", text_node.text)
+            return LeafNode("i", text_node.text, safe=safe)
         case TextType.CODE:
-            return LeafNode("code", text_node.text)
+            return LeafNode("code", text_node.text, safe=safe)
         case TextType.LINK:
-            return LeafNode("a", text_node.text, {"href": text_node.url})
+            url = quote_attribute(text_node.url) if safe else text_node.url
+            return LeafNode("a", text_node.text, {"href": url}, safe=safe)
         case TextType.IMAGE:
-            return LeafNode("img", "", {"src": text_node.url, "alt": text_node.text})
+            props = image_props(text_node.url, text_node.text)
+            if safe:
+                props = {name: quote_attribute(value) for name, value in props.items()}
+            return LeafNode("img", "", props, safe=safe)
         case _:
             raise Exception("Invalid conversion of text node: wrong TextType passed")
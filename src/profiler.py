@@ -0,0 +1,115 @@
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+_enabled = False
+_disabled_stage = nullcontext()
+_stages = {}
+_pages = []
+_stack = []
+
+
+def _enter():
+    _stack.append([time.perf_counter(), time.process_time(), 0.0, 0.0])
+
+
+def _exit(name):
+    wall_start, cpu_start, child_wall, child_cpu = _stack.pop()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    totals = _stages.setdefault(name, {"wall": 0.0, "cpu": 0.0, "calls": 0})
+    totals["wall"] += wall - child_wall
+    totals["cpu"] += cpu - child_cpu
+    totals["calls"] += 1
+
+    if _stack:
+        _stack[-1][2] += wall
+        _stack[-1][3] += cpu
+
+    return wall, cpu
+
+
+@contextmanager
+def _timed_stage(name):
+    _enter()
+    try:
+        yield
+    finally:
+        _exit(name)
+
+
+@contextmanager
+def _timed_page(path):
+    _enter()
+    try:
+        yield
+    finally:
+        wall, cpu = _exit("page (other)")
+        _pages.append({"page": path, "wall": wall, "cpu": cpu})
+
+
+def stage(name):
+    if not _enabled:
+        return _disabled_stage
+
+    return _timed_stage(name)
+
+
+def page(path):
+    if not _enabled:
+        return _disabled_stage
+
+    return _timed_page(path)
+
+
+def enable():
+    global _enabled
+    _enabled = True
+    _stages.clear()
+    _pages.clear()
+    _stack.clear()
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def report(top=10):
+    pages = sorted(_pages, key=lambda row: row["wall"], reverse=True)
+    return {
+        "stages": _stages,
+        "pages": pages,
+        "slowest": pages[:top],
+    }
+
+
+def write_report(path, top=10):
+    data = report(top)
+
+    report_dir = os.path.dirname(path)
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+
+    print(f"\n{'stage':<16} {'wall (ms)':>10} {'cpu (ms)':>10} {'calls':>8}")
+    for name, totals in sorted(
+        data["stages"].items(), key=lambda item: item[1]["wall"], reverse=True
+    ):
+        print(
+            f"{name:<16} {totals['wall'] * 1000:>10.1f} "
+            f"{totals['cpu'] * 1000:>10.1f} {totals['calls']:>8}"
+        )
+
+    print(f"\nTop {len(data['slowest'])} slowest pages:")
+    for row in data["slowest"]:
+        print(
+            f"  {row['wall'] * 1000:8.1f} ms wall {row['cpu'] * 1000:8.1f} ms cpu"
+            f"  {row['page']}"
+        )
+
+    print(f"\nProfile written to {path}")
@@ -1,9 +1,14 @@
 import unittest
+from markdown import highlight
+from markdown.highlight import get_highlighter, set_highlighter
 from markdown.block_markdown import (
     BlockType,
     markdown_to_blocks,
     block_to_block_type,
     markdown_to_html_node,
+    markdown_lines_to_html_node,
+    parse_markdown,
+    find_block_title,
 )
 
 
@@ -29,6 +34,10 @@ This is the same paragraph on a new line
             ],
         )
 
+    def test_markdown_to_blocks_only_empty_lines_separate(self):
+        self.assertEqual(markdown_to_blocks("a\n \nb"), ["a\n \nb"])
+        self.assertEqual(markdown_to_blocks(" \n\n  a\n\t\n\nb"), ["a", "b"])
+
     def test_markdown_to_blocks_newlines(self):
         md = """
 This is **bolded** paragraph
@@ -117,6 +126,11 @@ code
 
         self.assertEqual(block_type, BlockType.UNORDERED_LIST)
 
+    def test_block_to_lists_and_quotes_ignore_blank_lines(self):
+        self.assertEqual(block_to_block_type("- a\n  \n- b"), BlockType.UNORDERED_LIST)
+        self.assertEqual(block_to_block_type("> a\n\t\n> b"), BlockType.QUOTE)
+        self.assertEqual(block_to_block_type("1. a\n \n2. b"), BlockType.PARAGRAPH)
+
     def test_block_to_ordered_list(self):
         text_block = """1. This is the first list item in a list block
 2. This is a list item
@@ -229,6 +243,146 @@ this is paragraph text
             "<div><blockquote>This is a blockquote block</blockquote><p>this is paragraph text</p></div>",
         )
 
+    def test_codeblock_with_blank_lines(self):
+        md = """
+```
+first line
+
+after a blank line
+```
+
+paragraph after code
+"""
+
+        node = markdown_to_html_node(md)
+        html = node.to_html()
+        self.assertEqual(
+            html,
+            "<div><pre><code>first line\n\nafter a blank line\n</code></pre>"
+            "<p>paragraph after code</p></div>",
+        )
+
+    def test_codeblock_with_language(self):
+        md = "```python\nprint('<hi>')\n```"
+
+        self.assertIsNone(get_highlighter())
+        html = markdown_to_html_node(md).to_html()
+
+        self.assertEqual(
+            html,
+            "<div><pre><code class=\"language-python\">"
+            "print('&lt;hi&gt;')\n</code></pre></div>",
+        )
+
+    @unittest.skipIf(highlight.pygments is None, "Pygments is not installed")
+    def test_pygments_stylesheet_is_scoped_to_code_blocks(self):
+        highlighter = highlight.PygmentsHighlighter()
+
+        html = highlighter("import os", "python")
+        rules = highlighter.stylesheet().splitlines()
+
+        self.assertIn('<span class="kn">import</span>', html)
+        self.assertTrue(all(rule.startswith("pre code") for rule in rules))
+        self.assertIn("pre code .kn {", "\n".join(rules))
+
+    def test_codeblock_uses_highlighter(self):
+        def fake_highlighter(code, language):
+            if language == "python":
+                return f"<span>{code}</span>"
+
+        fake_highlighter.version = "fake"
+        highlighter = get_highlighter()
+        set_highlighter(fake_highlighter)
+        try:
+            python = markdown_to_html_node("```python\nx\n```").to_html()
+            unknown = markdown_to_html_node("```cobol\n<x>\n```").to_html()
+        finally:
+            set_highlighter(highlighter)
+
+        self.assertEqual(
+            python,
+            '<div><pre><code class="language-python">'
+            "<span>x\n</span></code></pre></div>",
+        )
+        self.assertEqual(
+            unknown,
+            '<div><pre><code class="language-cobol">&lt;x&gt;\n</code></pre></div>',
+        )
+
+    def test_markdown_to_blocks_keeps_fenced_code_together(self):
+        md = "intro\n\n```\na\n\nb\n```\n\noutro"
+
+        self.assertEqual(
+            markdown_to_blocks(md), ["intro", "```\na\n\nb\n```", "outro"]
+        )
+
+    def test_markdown_lines_match_whole_document(self):
+        md = "# Title\n\n> quote\n\n```\ncode\n\nmore\n```\n\n- a\n- b\n"
+        lines = iter(md.split("\n"))
+
+        self.assertEqual(
+            markdown_lines_to_html_node(lines).to_html(),
+            markdown_to_html_node(md).to_html(),
+        )
+
+
+class TestParseMarkdown(unittest.TestCase):
+    def test_parse_collects_metadata(self):
+        md = """
+# The **Hobbit**
+
+Some intro words [here](/intro) ![](/owl.png)
+
+## There and back
+
+```
+# not a heading
+```
+"""
+
+        document = parse_markdown(md)
+
+        self.assertEqual(document.title, "The Hobbit")
+        self.assertEqual(document.headings, [(1, "The Hobbit"), (2, "There and back")])
+        self.assertEqual(document.word_count, 9)
+        self.assertEqual(document.links, ["/intro"])
+        self.assertEqual(document.images, ["/owl.png"])
+        self.assertEqual(document.node.to_html(), markdown_to_html_node(md).to_html())
+
+    def test_markdown_text_is_escaped_once(self):
+        md = """
+# Q & A
+
+Compare `a<b` with [x & y](/search?q=a&b) and 3 > 2.
+
+```
+if a < b:
+    print("&")
+```
+"""
+        document = parse_markdown(md)
+
+        self.assertEqual(
+            document.node.to_html(),
+            "<div><h1>Q &amp; A</h1><p>Compare <code>a&lt;b</code> with "
+            '<a href="/search?q=a&amp;b">x &amp; y</a> and 3 &gt; 2.</p>'
+            '<pre><code>if a &lt; b:\n    print("&amp;")\n</code></pre></div>',
+        )
+        self.assertEqual(document.headings, [(1, "Q & A")])
+        self.assertEqual(document.summary, "Compare a<b with x & y and 3 > 2.")
+        self.assertEqual(document.links, ["/search?q=a&b"])
+
+    def test_find_block_title_skips_code(self):
+        lines = ["```", "# not title", "```", "", "## Sub", "", "# A **bold** title"]
+
+        self.assertEqual(find_block_title(lines), "A bold title")
+        self.assertIsNone(find_block_title(["## Only a subtitle"]))
+
+    def test_parse_without_title(self):
+        document = parse_markdown("## Only a subtitle")
+
+        self.assertIsNone(document.title)
+
 
 if __name__ == "__main__":
     unittest.main()
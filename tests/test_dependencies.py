@@ -0,0 +1,92 @@
+import os
+import unittest
+
+from generator.dependencies import (
+    internal_links,
+    resolve_link,
+    entry_reasons,
+    linked_pages,
+)
+
+
+def entry(output, title, links=(), source="a"):
+    return {
+        "source": source,
+        "template_path": "template.html",
+        "template": "t",
+        "basepath": "/",
+        "version": "2",
+        "output": output,
+        "info": {"title": title, "links": list(links)},
+    }
+
+
+class TestDependencies(unittest.TestCase):
+    def test_internal_links(self):
+        hrefs = ["/blog/tom/", "https://example.com", "//cdn.example.com", "/#top", "/"]
+        hrefs += ["mailto:me@example.com", "#top", "../tom#bio", "images/a.png?v=2"]
+
+        self.assertEqual(
+            internal_links(hrefs), ["/blog/tom", "/", "../tom", "images/a.png"]
+        )
+
+    def test_resolve_link(self):
+        page = os.path.join("docs", "blog", "tom", "index.html")
+
+        self.assertEqual(resolve_link("/about", page, "docs"), "/about")
+        self.assertEqual(resolve_link("../majesty/", page, "docs"), "/blog/majesty")
+        self.assertEqual(resolve_link("owl.png", page, "docs"), "/blog/tom/owl.png")
+        self.assertEqual(
+            resolve_link("tom", os.path.join("docs", "about.html"), "docs"), "/tom"
+        )
+
+    def test_entry_reasons(self):
+        old = entry("docs/index.html", "Home")
+        new = dict(old, source="b", template="u")
+
+        self.assertEqual(entry_reasons(None, new), ["new page"])
+        self.assertEqual(entry_reasons(old, dict(old)), [])
+        self.assertEqual(
+            entry_reasons(old, new), ["source changed", "template changed"]
+        )
+        self.assertEqual(
+            entry_reasons(old, dict(old, highlighter="pygments-2")),
+            ["highlighter changed"],
+        )
+
+    def test_retitled_page_reports_linking_pages(self):
+        previous = {
+            "content/index.md": entry("docs/index.html", "Home", ["/blog/tom"]),
+            "content/blog/tom/index.md": entry("docs/blog/tom/index.html", "Tom"),
+            "content/contact/index.md": entry(
+                "docs/contact/index.html", "Contact", ["../blog/tom/"]
+            ),
+        }
+        current = dict(previous)
+        current["content/blog/tom/index.md"] = entry(
+            "docs/blog/tom/index.html", "Tom Bombadil", source="b"
+        )
+
+        reasons = linked_pages(
+            previous, current, "docs", {"content/blog/tom/index.md": ["source changed"]}
+        )
+
+        self.assertEqual(
+            reasons,
+            {
+                "content/contact/index.md": ["links to /blog/tom (retitled)"],
+                "content/index.md": ["links to /blog/tom (retitled)"],
+            },
+        )
+
+    def test_unchanged_title_reports_no_linking_pages(self):
+        previous = {
+            "content/index.md": entry("docs/index.html", "Home", ["/blog/tom"]),
+            "content/blog/tom/index.md": entry("docs/blog/tom/index.html", "Tom"),
+        }
+
+        self.assertEqual(linked_pages(previous, dict(previous), "docs", {}), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
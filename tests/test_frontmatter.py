@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from generator.frontmatter import (
+    parse_scalar,
+    split_front_matter,
+    read_front_matter,
+)
+
+
+class TestFrontMatter(unittest.TestCase):
+    def test_parse_scalar(self):
+        self.assertEqual(parse_scalar(' "quoted: value" '), "quoted: value")
+        self.assertEqual(parse_scalar("[a, 'b', 3]"), ["a", "b", 3])
+        self.assertEqual(parse_scalar("true"), True)
+        self.assertEqual(parse_scalar("No"), False)
+        self.assertEqual(parse_scalar("2026-10-01"), "2026-10-01")
+
+    def test_split_yaml_front_matter(self):
+        md = "---\ntitle: Hello\ntags:\n  - tolkien\n  - elves\ndraft: false\n---\n# Body"
+
+        metadata, body = split_front_matter(md)
+
+        self.assertEqual(
+            metadata, {"title": "Hello", "tags": ["tolkien", "elves"], "draft": False}
+        )
+        self.assertEqual(body, "# Body")
+
+    def test_split_toml_front_matter(self):
+        metadata, body = split_front_matter('+++\ntitle = "Hi"\n+++\ntext')
+
+        self.assertEqual(metadata, {"title": "Hi"})
+        self.assertEqual(body, "text")
+
+    def test_no_front_matter(self):
+        md = "# Title\n\n---\n"
+
+        self.assertEqual(split_front_matter(md), ({}, md))
+
+    def test_string_keys_are_not_coerced(self):
+        md = "---\ntitle: 1984\nsummary: yes\ntemplate: No\ncount: 3\n---\n"
+
+        metadata, _ = split_front_matter(md)
+
+        self.assertEqual(
+            metadata,
+            {"title": "1984", "summary": "yes", "template": "No", "count": 3},
+        )
+
+    def test_unclosed_front_matter_is_body_text(self):
+        md = "---\ntitle: Hello\n# Body"
+
+        self.assertEqual(split_front_matter(md), ({}, md))
+
+    def test_read_front_matter_stops_at_header(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.md")
+            with open(path, "w") as file:
+                file.write("---\ndraft: true\n---\n")
+                file.write("# Huge body\n" * 1000)
+
+            self.assertEqual(read_front_matter(path), {"draft": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from generator.html_cache import HTMLCache
+from generator.highlight_cache import CachedHighlighter
+
+
+class TestHTMLCache(unittest.TestCase):
+    def test_render_uses_cached_html(self):
+        calls = []
+
+        def render(markdown):
+            calls.append(markdown)
+            return "<p>hello</p>"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = HTMLCache(tmp)
+
+            self.assertEqual(cache.render("hello", render), "<p>hello</p>")
+            self.assertEqual(cache.render("hello", render), "<p>hello</p>")
+            self.assertEqual(calls, ["hello"])
+
+    def test_miss_returns_none(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(HTMLCache(tmp).get("never cached"))
+
+    def test_prune_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = HTMLCache(tmp, max_bytes=10)
+            cache.put("old", "x" * 8)
+            cache.put("new", "y" * 8)
+
+            old_path = cache.path(cache.key("old"))
+            os.utime(old_path, (0, 0))
+
+            self.assertEqual(cache.prune(), 1)
+            self.assertIsNone(cache.get("old"))
+            self.assertEqual(cache.get("new"), "y" * 8)
+
+
+class TestCachedHighlighter(unittest.TestCase):
+    def test_highlights_each_snippet_once(self):
+        calls = []
+
+        def highlighter(code, language):
+            calls.append((code, language))
+            return f"<span>{code}</span>"
+
+        highlighter.version = "1"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cached = CachedHighlighter(highlighter, tmp)
+
+            self.assertEqual(cached("x = 1", "python"), "<span>x = 1</span>")
+            self.assertEqual(cached("x = 1", "python"), "<span>x = 1</span>")
+            cached("x = 1", "ruby")
+            self.assertEqual(
+                CachedHighlighter(highlighter, tmp)("x = 1", "python"),
+                "<span>x = 1</span>",
+            )
+
+            highlighter.version = "2"
+            CachedHighlighter(highlighter, tmp)("x = 1", "python")
+
+        self.assertEqual(
+            calls, [("x = 1", "python"), ("x = 1", "ruby"), ("x = 1", "python")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
+import io
 import unittest
 
-from markdown.htmlnode import HTMLNode, LeafNode, ParentNode
+from markdown.htmlnode import HTMLNode, LeafNode, ParentNode, StreamNode
 
 class TestHTMLNode(unittest.TestCase):
     def test_node_repr(self):
@@ -107,6 +108,43 @@ class TestHTMLNode(unittest.TestCase):
             parent_node.to_html()
         self.assertEqual(str(context.exception), "Invaild HMTL: no children passed")
 
+    def test_parentnode_iter_html(self):
+        parent_node = ParentNode("p", [LeafNode(None, "Hi "), LeafNode("b", "there")])
+        self.assertEqual(
+            list(parent_node.iter_html()), ["<p>", "Hi ", "<b>there</b>", "</p>"]
+        )
+
+    def test_parentnode_write_html(self):
+        parent_node = ParentNode(
+            "ul", [ParentNode("li", [LeafNode("a", "home", {"href": "/"})])]
+        )
+        out = io.StringIO()
+        parent_node.write_html(out)
+        self.assertEqual(out.getvalue(), parent_node.to_html())
+        self.assertEqual(out.getvalue(), '<ul><li><a href="/">home</a></li></ul>')
+
+    def test_streamnode_renders_once(self):
+        node = StreamNode("div", (LeafNode("p", text) for text in ("a", "b")))
+
+        self.assertEqual(repr(node), "StreamNode(div, <stream>, None)")
+        self.assertEqual(node.to_html(), "<div><p>a</p><p>b</p></div>")
+        with self.assertRaises(ValueError) as context:
+            node.to_html()
+        self.assertEqual(
+            str(context.exception), "StreamNode children can only be rendered once"
+        )
+
+    def test_leafnode_escapes_value_and_props(self):
+        node = LeafNode("a", "<b> & co", {"href": '/q?a=1&b="2"'})
+        self.assertEqual(
+            node.to_html(),
+            '<a href="/q?a=1&amp;b=&quot;2&quot;">&lt;b&gt; &amp; co</a>',
+        )
+
+    def test_safe_leafnode_is_not_escaped_again(self):
+        node = LeafNode("span", "&lt;b&gt;", safe=True)
+        self.assertEqual(node.to_html(), "<span>&lt;b&gt;</span>")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,117 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+
+from generator import images
+from generator.images import ImagePipeline, image_size
+
+
+def png_header(width, height):
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    chunk = struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr
+    return b"\x89PNG\r\n\x1a\n" + chunk + struct.pack(">I", zlib.crc32(b"IHDR" + ihdr))
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+class TestImageSize(unittest.TestCase):
+    def test_image_size(self):
+        jpeg = (
+            b"\xff\xd8"
+            + b"\xff\xe0\x00\x04\x00\x00"
+            + b"\xff\xc0\x00\x11\x08\x01\x2c\x02\x58"
+            + b"\x00" * 12
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, data, size in (
+                ("a.png", png_header(1100, 438), (1100, 438)),
+                ("b.gif", b"GIF89a" + struct.pack("<HH", 64, 32), (64, 32)),
+                ("c.jpg", jpeg, (600, 300)),
+                ("d.txt", b"not an image", None),
+            ):
+                path = os.path.join(tmp, name)
+                write(path, data)
+                self.assertEqual(image_size(path), size)
+
+
+class TestImagePipeline(unittest.TestCase):
+    def test_dimensions_without_resizing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            static = os.path.join(tmp, "static")
+            write(os.path.join(static, "images", "owl.png"), png_header(1100, 438))
+            pipeline = ImagePipeline(
+                static, os.path.join(tmp, "docs"), os.path.join(tmp, "cache")
+            )
+            image = images.Image
+            images.Image = None
+            try:
+                props = pipeline("/images/owl.png")
+            finally:
+                images.Image = image
+
+            self.assertEqual(props, {"width": "1100", "height": "438"})
+            self.assertIsNone(pipeline("/images/missing.png"))
+            self.assertIsNone(pipeline("https://example.com/owl.png"))
+
+    def test_variants_are_processed_once(self):
+        resized = []
+
+        def fake_resize(src_path, dest_path, width):
+            resized.append(width)
+            write(dest_path, b"variant")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            static = os.path.join(tmp, "static")
+            docs = os.path.join(tmp, "docs")
+            cache = os.path.join(tmp, "cache")
+            write(os.path.join(static, "images", "owl.png"), png_header(1100, 438))
+
+            image, resize_image = images.Image, images.resize_image
+            images.Image, images.resize_image = object(), fake_resize
+            try:
+                props = ImagePipeline(static, docs, cache)("/images/owl.png")
+                pipeline = ImagePipeline(static, docs, cache)
+                again = pipeline("/images/owl.png")
+                published = pipeline.publish(["/images/owl.png", "/images/owl.png"])
+            finally:
+                images.Image, images.resize_image = image, resize_image
+
+            self.assertEqual(resized, [480, 960])
+            self.assertEqual(props, again)
+            self.assertEqual(
+                props["srcset"],
+                "/images/owl-480w.png 480w, /images/owl-960w.png 960w, "
+                "/images/owl.png 1100w",
+            )
+            self.assertEqual(props["sizes"], "(max-width: 1100px) 100vw, 1100px")
+            self.assertEqual(published, ["images/owl-480w.png", "images/owl-960w.png"])
+            variant = os.path.join(docs, "images", "owl-960w.png")
+            self.assertTrue(os.path.isfile(variant))
+
+    def test_stamp_covers_only_referenced_images(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            static = os.path.join(tmp, "static")
+            write(os.path.join(static, "owl.png"), png_header(10, 10))
+            write(os.path.join(static, "cat.png"), png_header(10, 10))
+            pipeline = ImagePipeline(
+                static, os.path.join(tmp, "docs"), os.path.join(tmp, "cache")
+            )
+            owl = pipeline.stamp(["/owl.png"])
+            cat = pipeline.stamp(["/cat.png"])
+
+            write(os.path.join(static, "cat.png"), png_header(20, 20) + b"\0")
+
+            self.assertEqual(pipeline.stamp(["/owl.png"]), owl)
+            self.assertNotEqual(pipeline.stamp(["/cat.png"]), cat)
+            self.assertEqual(pipeline.version, ImagePipeline(static, tmp).version)
+
+
+if __name__ == "__main__":
+    unittest.main()
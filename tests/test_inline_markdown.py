@@ -9,6 +9,7 @@ from markdown.inline_markdown import (
     split_nodes_link,
     text_to_textnodes,
     extract_title,
+    find_title,
 )
 
 
@@ -176,6 +177,11 @@ class TestInlineMarkdown(unittest.TestCase):
         
         self.assertEqual(str(context.exception), "No h1 title has been provided")
 
+    def test_find_title_in_lines(self):
+        lines = iter(["Intro", "## Subtitle", "# Real title  ", "# Later title"])
+
+        self.assertEqual(find_title(lines), "Real title")
+
     def test_split_image_single(self):
         node = TextNode(
             "![image](https://www.example.COM/IMAGE.PNG)",
@@ -279,6 +285,20 @@ class TestInlineMarkdown(unittest.TestCase):
             new_nodes,
         )
 
+    def test_split_link_after_image_with_same_text(self):
+        node = TextNode(
+            "An ![owl](/owl.png) and a [owl](/owl.png) link", TextType.TEXT
+        )
+        new_nodes = split_nodes_link([node])
+        self.assertListEqual(
+            [
+                TextNode("An ![owl](/owl.png) and a ", TextType.TEXT),
+                TextNode("owl", TextType.LINK, "/owl.png"),
+                TextNode(" link", TextType.TEXT),
+            ],
+            new_nodes,
+        )
+
     def test_unclosed_markdown_link(self):
         node = TextNode(
             "This is an example of not closed markdown [picture](https://example.com/picture.jpg and some text on top of it",
@@ -334,6 +354,46 @@ class TestInlineMarkdown(unittest.TestCase):
 
         self.assertListEqual(node_split, expected_split)
 
+    def test_text_to_textnodes_adjacent_media(self):
+        node_split = text_to_textnodes("![cat](/cat.png)[home](/)")
+
+        self.assertListEqual(
+            node_split,
+            [
+                TextNode("cat", TextType.IMAGE, "/cat.png"),
+                TextNode("home", TextType.LINK, "/"),
+            ],
+        )
+
+    def test_text_to_textnodes_unclosed_delimiter(self):
+        with self.assertRaises(ValueError) as context:
+            text_to_textnodes("This is `unclosed code and **bold**")
+
+        self.assertEqual(
+            str(context.exception), "Invalid markdown: delimiter was not closed"
+        )
+
+    def test_text_to_textnodes_spans_are_literal(self):
+        node_split = text_to_textnodes("**a _b_ [c](/c)**_`d`_`e`****f")
+
+        self.assertListEqual(
+            node_split,
+            [
+                TextNode("a _b_ [c](/c)", TextType.BOLD),
+                TextNode("`d`", TextType.ITALIC),
+                TextNode("e", TextType.CODE),
+                TextNode("f", TextType.TEXT),
+            ],
+        )
+
+    def test_text_to_textnodes_inner_delimiter_closes_nothing(self):
+        for text in ("_a **b** c_", "`a_b`", "[a_b](/c)"):
+            with self.assertRaises(ValueError):
+                text_to_textnodes(text)
+
+    def test_text_to_textnodes_empty(self):
+        self.assertListEqual(text_to_textnodes(""), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,53 @@
+import os
+import unittest
+
+from generator.link_checker import site_urls, find_dangling_links
+
+
+class TestLinkChecker(unittest.TestCase):
+    def test_site_urls(self):
+        outputs = [
+            os.path.join("docs", "index.html"),
+            os.path.join("docs", "blog", "tom", "index.html"),
+            os.path.join("docs", "images", "tolkien.png"),
+        ]
+
+        self.assertEqual(
+            site_urls(outputs, "docs"),
+            {
+                "/",
+                "/index.html",
+                "/blog/tom",
+                "/blog/tom/index.html",
+                "/images/tolkien.png",
+            },
+        )
+
+    def test_find_dangling_links(self):
+        records = [
+            (
+                "content/index.md",
+                "docs/index.html",
+                {"links": ["/blog/tom", "/nope"], "images": ["/images/owl.png"]},
+            ),
+            ("content/old.md", "docs/old.html", {"links": ["/"]}),
+            (
+                "content/blog/tom/index.md",
+                "docs/blog/tom/index.html",
+                {"links": ["../../", "../majesty", "gone"], "images": ["owl.png"]},
+            ),
+        ]
+        known = {"/", "/blog/tom", "/blog/majesty", "/blog/tom/owl.png"}
+
+        self.assertEqual(
+            find_dangling_links(records, known, "docs"),
+            [
+                ("content/index.md", "/nope"),
+                ("content/index.md", "/images/owl.png"),
+                ("content/blog/tom/index.md", "gone"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import unittest
+
+from generator.listing import (
+    page_url,
+    build_index,
+    paginate,
+    listing_digest,
+    listing_to_html_node,
+)
+
+
+def record(name, date):
+    return (
+        os.path.join("content", "blog", name, "index.md"),
+        os.path.join("docs", "blog", name, "index.html"),
+        {"title": name.capitalize(), "date": date, "summary": ""},
+    )
+
+
+class TestListing(unittest.TestCase):
+    def test_page_url(self):
+        self.assertEqual(page_url(os.path.join("docs", "index.html"), "docs"), "/")
+        self.assertEqual(
+            page_url(os.path.join("docs", "blog", "tom", "index.html"), "docs"),
+            "/blog/tom",
+        )
+
+    def test_build_index_sorts_oldest_first(self):
+        records = [
+            record("tom", "2026-03-01"),
+            record("majesty", "2026-01-01"),
+            (
+                os.path.join("content", "index.md"),
+                os.path.join("docs", "index.html"),
+                {},
+            ),
+        ]
+
+        index = build_index(records, "content", "docs", sections=("blog",))
+
+        self.assertEqual(
+            [entry["url"] for entry in index["blog"]], ["/blog/majesty", "/blog/tom"]
+        )
+
+    def test_adding_post_keeps_older_pages_stable(self):
+        entries = [
+            {"url": f"/blog/{i}", "title": str(i), "date": "", "summary": ""}
+            for i in range(6)
+        ]
+        before = paginate(entries[:5], size=2)
+        after = paginate(entries, size=2)
+
+        self.assertEqual(before[:2], after[:2])
+        self.assertEqual(
+            listing_digest(before[0], 1, len(before), "t", "/"),
+            listing_digest(after[0], 1, len(after), "t", "/"),
+        )
+
+    def test_empty_section_has_no_pages(self):
+        self.assertEqual(paginate([]), [])
+
+    def test_listing_to_html_node(self):
+        entries = [{"url": "/blog/tom", "title": "Tom", "date": "2026", "summary": ""}]
+
+        html = listing_to_html_node("blog", entries, 2, 2).to_html()
+
+        self.assertEqual(
+            html,
+            '<div><h1>Blog</h1><ul><li><a href="/blog/tom">Tom</a><time>2026</time>'
+            '</li></ul><nav><a href="/blog/page/1">Older posts</a></nav></div>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
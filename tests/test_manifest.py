@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+from generator.manifest import (
+    hash_file,
+    page_entry,
+    load_manifest,
+    save_manifest,
+    remove_output,
+)
+
+
+class TestManifest(unittest.TestCase):
+    def test_manifest_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest_path = os.path.join(tmp, "cache", "manifest.json")
+            pages = {"content/index.md": page_entry("a", "template.html", "b", "/", "docs/index.html")}
+
+            save_manifest(manifest_path, pages)
+
+            self.assertEqual(load_manifest(manifest_path), pages)
+
+    def test_missing_manifest(self):
+        self.assertEqual(load_manifest("/nonexistent/manifest.json"), {})
+
+    def test_corrupt_manifest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest_path = os.path.join(tmp, "manifest.json")
+            with open(manifest_path, "w") as file:
+                file.write("{not json")
+
+            self.assertEqual(load_manifest(manifest_path), {})
+
+    def test_hash_file_changes_with_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w") as file:
+                file.write("# Title")
+            first = hash_file(path)
+
+            with open(path, "w") as file:
+                file.write("# Other title")
+
+            self.assertNotEqual(first, hash_file(path))
+
+    def test_remove_output_prunes_empty_dirs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "blog", "post", "index.html")
+            os.makedirs(os.path.dirname(output))
+            with open(output, "w") as file:
+                file.write("<p></p>")
+
+            remove_output(output, tmp)
+
+            self.assertFalse(os.path.exists(os.path.join(tmp, "blog")))
+            self.assertTrue(os.path.isdir(tmp))
+
+    def test_remove_output_stays_inside_root(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = os.path.join(tmp, "docs")
+            output = os.path.join(tmp, "docs2", "index.html")
+            os.makedirs(root)
+            os.makedirs(os.path.dirname(output))
+            with open(output, "w") as file:
+                file.write("<p></p>")
+
+            remove_output(output, root)
+
+            self.assertTrue(os.path.isdir(os.path.join(tmp, "docs2")))
+
+
+if __name__ == "__main__":
+    unittest.main()
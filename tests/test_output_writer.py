@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+
+from generator.output_writer import OutputFile, write_output
+
+
+class TestOutputWriter(unittest.TestCase):
+    def test_skips_identical_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+
+            self.assertTrue(write_output(path, "<p>hello</p>"))
+            mtime = os.stat(path).st_mtime_ns
+            self.assertFalse(write_output(path, "<p>hello</p>"))
+            self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+
+            self.assertTrue(write_output(path, "<p>bye</p>"))
+            with open(path) as file:
+                self.assertEqual(file.read(), "<p>bye</p>")
+            self.assertEqual(os.listdir(tmp), ["index.html"])
+
+    def test_failed_write_keeps_previous_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.html")
+            write_output(path, "<p>hello</p>")
+
+            with self.assertRaises(ValueError):
+                with OutputFile(path) as output:
+                    output.write("<p>half")
+                    raise ValueError("render failed")
+
+            with open(path) as file:
+                self.assertEqual(file.read(), "<p>hello</p>")
+            self.assertEqual(os.listdir(tmp), ["index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,379 @@
+import contextlib
+import functools
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from generator import page_generator
+from generator.images import ImagePipeline
+from generator.page_generator import (
+    plan_build,
+    render_pages,
+    generate_page,
+    traverse_and_generate_html,
+    incremental_generate_html,
+)
+from markdown.highlight import get_highlighter, set_highlighter
+from markdown.images import set_image_processor
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(text)
+
+
+class TestBuildPlan(unittest.TestCase):
+    def test_plan_build(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "content")
+            destination = os.path.join(tmp, "docs")
+            template = os.path.join(tmp, "template.html")
+            write(os.path.join(source, "index.md"), "# Home")
+            write(os.path.join(source, "blog", "tom", "index.md"), "# Tom")
+            write(os.path.join(source, "blog", "draft.md"), "---\ndraft: true\n---\n")
+            write(os.path.join(source, "about.md"), "# About")
+
+            plan = plan_build(source, destination, template)
+
+            self.assertEqual(
+                plan.destinations,
+                [
+                    os.path.join(destination, "about.html"),
+                    os.path.join(destination, "blog", "tom", "index.html"),
+                    os.path.join(destination, "index.html"),
+                ],
+            )
+            self.assertEqual(
+                plan.directories,
+                [destination, os.path.join(destination, "blog", "tom")],
+            )
+
+            plan.create_directories()
+            self.assertTrue(os.path.isdir(os.path.join(destination, "blog", "tom")))
+
+
+def make_site(tmp, pages):
+    source = os.path.join(tmp, "content")
+    template = os.path.join(tmp, "template.html")
+    write(template, "<title>{{ Title }}</title>{{ Content }}")
+    for name, text in pages.items():
+        write(os.path.join(source, name), text)
+
+    return source, template
+
+
+def render(source, template, destination, jobs):
+    plan = plan_build(source, destination, template)
+    plan.create_directories()
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        try:
+            infos = render_pages(plan.pages, "/", jobs)
+        except Exception as error:
+            return str(error), out.getvalue().replace(destination, "")
+
+    outputs = []
+    for dest_path in plan.destinations:
+        with open(dest_path) as file:
+            outputs.append(file.read())
+
+    return (infos, outputs), out.getvalue().replace(destination, "")
+
+
+class UpperHighlighter:
+    version = "upper"
+
+    def __call__(self, code, language):
+        return code.upper()
+
+
+class TestRenderPages(unittest.TestCase):
+    def test_parallel_matches_serial(self):
+        pages = {f"post{index}.md": f"# Post {index}\n\nBody" for index in range(9)}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            source, template = make_site(tmp, pages)
+            serial = render(source, template, os.path.join(tmp, "serial"), 1)
+            parallel = render(source, template, os.path.join(tmp, "parallel"), 3)
+
+        (infos, outputs), log = serial
+        titles = [f"Post {index}" for index in range(9)]
+        self.assertEqual([info["title"] for info in infos], titles)
+        self.assertIn("<title>Post 0</title>", outputs[0])
+        self.assertEqual(log.count(" * converting"), 9)
+        self.assertEqual(parallel, serial)
+
+    def test_spawned_workers_use_installed_highlighter(self):
+        pages = {f"p{index}.md": f"# P{index}\n\n```py\nx\n```" for index in range(4)}
+        spawn = multiprocessing.get_context("spawn")
+        executor, highlighter = page_generator.ProcessPoolExecutor, get_highlighter()
+        page_generator.ProcessPoolExecutor = functools.partial(
+            executor, mp_context=spawn
+        )
+        set_highlighter(UpperHighlighter())
+
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                source, template = make_site(tmp, pages)
+                docs = os.path.join(tmp, "docs")
+                (_, outputs), _ = render(source, template, docs, 2)
+        finally:
+            page_generator.ProcessPoolExecutor = executor
+            set_highlighter(highlighter)
+
+        for output in outputs:
+            self.assertIn('language-py">X\n</code>', output)
+
+    def test_front_matter_titles_stay_strings(self):
+        pages = {
+            "a.md": "---\ntitle: 1984\n---\n# A",
+            "b.md": "---\ntitle: yes\n---\n# B",
+            "c.md": "---\ntitle: No\n---\n# C",
+            "d.md": "---\n\n# Unclosed\n\ntext",
+        }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            source, template = make_site(tmp, pages)
+            (infos, outputs), _ = render(source, template, os.path.join(tmp, "d"), 1)
+
+        titles = [info["title"] for info in infos]
+        self.assertEqual(titles, ["1984", "yes", "No", "Unclosed"])
+        self.assertIn("<title>1984</title>", outputs[0])
+        self.assertIn("<p>---</p><h1>Unclosed</h1>", outputs[3])
+
+    def test_failures_are_aggregated(self):
+        pages = {
+            "a.md": "# A",
+            "b.md": "no title here",
+            "c.md": "# C",
+            "d.md": "still no title",
+            "e.md": "---\nnot front matter\n---\n# E",
+        }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            source, template = make_site(tmp, pages)
+            serial = render(source, template, os.path.join(tmp, "serial"), 1)
+            parallel = render(source, template, os.path.join(tmp, "parallel"), 2)
+
+        message, _ = serial
+        self.assertEqual(
+            message,
+            "Failed to generate 3 page(s):\n"
+            f"  - {os.path.join(source, 'b.md')}: "
+            "Exception: No h1 title has been provided\n"
+            f"  - {os.path.join(source, 'd.md')}: "
+            "Exception: No h1 title has been provided\n"
+            f"  - {os.path.join(source, 'e.md')}: "
+            "ValueError: Invalid front matter line: 'not front matter'",
+        )
+        self.assertEqual(parallel, serial)
+
+
+class TestStreamPage(unittest.TestCase):
+    def test_streamed_page_matches_parsed_page(self):
+        md = (
+            "```\n# not title\n[x](/code)\n```\n\n# The **real** title\n\n"
+            "See [Tom](/blog/tom) and ![owl](/images/owl.png)."
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            source, template = make_site(tmp, {"index.md": md})
+            src_path = os.path.join(source, "index.md")
+            outputs = []
+            for threshold in (page_generator.STREAMING_THRESHOLD_BYTES, 0):
+                dest_path = os.path.join(tmp, f"docs{threshold}", "index.html")
+                os.makedirs(os.path.dirname(dest_path))
+                original = page_generator.STREAMING_THRESHOLD_BYTES
+                page_generator.STREAMING_THRESHOLD_BYTES = threshold
+                try:
+                    info, _ = generate_page(src_path, template, dest_path, "/")
+                finally:
+                    page_generator.STREAMING_THRESHOLD_BYTES = original
+                with open(dest_path) as file:
+                    outputs.append((info, file.read()))
+
+        self.assertEqual(outputs[0][0]["title"], "The real title")
+        self.assertEqual(outputs[0][0]["links"], ["/blog/tom"])
+        self.assertEqual(outputs[0][0]["images"], ["/images/owl.png"])
+        self.assertIn("<title>The real title</title>", outputs[0][1])
+        for key in ("title", "links", "images"):
+            self.assertEqual(outputs[1][0][key], outputs[0][0][key])
+        self.assertEqual(outputs[1][1], outputs[0][1])
+
+    def test_streamed_page_with_front_matter_title(self):
+        md = "---\ntitle: Owls\n---\nIntro\n\n# Heading"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            source, template = make_site(tmp, {"index.md": md})
+            dest_path = os.path.join(tmp, "index.html")
+            original = page_generator.STREAMING_THRESHOLD_BYTES
+            page_generator.STREAMING_THRESHOLD_BYTES = 0
+            try:
+                info, _ = generate_page(
+                    os.path.join(source, "index.md"), template, dest_path, "/"
+                )
+            finally:
+                page_generator.STREAMING_THRESHOLD_BYTES = original
+            with open(dest_path) as file:
+                html = file.read()
+
+        self.assertEqual(info["title"], "Owls")
+        self.assertEqual(
+            html, "<title>Owls</title><div><p>Intro</p><h1>Heading</h1></div>"
+        )
+
+    def test_streamed_blog_post_is_listed(self):
+        pages = {"blog/big/index.md": "# Big post\n\nBody"}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            source, template = make_site(tmp, pages)
+            docs = os.path.join(tmp, "docs")
+            original = page_generator.STREAMING_THRESHOLD_BYTES
+            page_generator.STREAMING_THRESHOLD_BYTES = 0
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    traverse_and_generate_html(
+                        source,
+                        template,
+                        docs,
+                        "/",
+                        listing_manifest_path=os.path.join(tmp, "listings.json"),
+                    )
+            finally:
+                page_generator.STREAMING_THRESHOLD_BYTES = original
+
+            with open(os.path.join(docs, "blog", "index.html")) as file:
+                self.assertIn('<a href="/blog/big">Big post</a>', file.read())
+
+
+def incremental_build(source, template, destination, manifest, basepath="/"):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        try:
+            incremental_generate_html(source, template, destination, basepath, manifest)
+        except Exception as error:
+            return f"{out.getvalue()}{error}"
+
+    return out.getvalue()
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source, self.template = make_site(
+            self.tmp.name, {"index.md": "# Home", "blog/tom.md": "# Tom"}
+        )
+        self.docs = os.path.join(self.tmp.name, "docs")
+        self.manifest = os.path.join(self.tmp.name, "manifest.json")
+        self.build()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, basepath="/"):
+        return incremental_build(
+            self.source, self.template, self.docs, self.manifest, basepath
+        )
+
+    def converted(self, log):
+        return sorted(
+            os.path.relpath(line.split(" -> ")[0][len(" * converting ") :], self.source)
+            for line in log.splitlines()
+            if line.startswith(" * converting ")
+        )
+
+    def test_unchanged_pages_are_skipped(self):
+        log = self.build()
+
+        self.assertEqual(self.converted(log), [])
+        self.assertIn("Rendered 0, unchanged 2, removed 0", log)
+
+    def test_source_change_rerenders_only_that_page(self):
+        write(os.path.join(self.source, "blog", "tom.md"), "# Tom Bombadil")
+
+        log = self.build()
+
+        self.assertEqual(self.converted(log), ["blog/tom.md"])
+        with open(os.path.join(self.docs, "blog", "tom.html")) as file:
+            self.assertIn("<title>Tom Bombadil</title>", file.read())
+
+    def test_template_and_basepath_changes_rerender_everything(self):
+        write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(self.converted(self.build()), ["blog/tom.md", "index.md"])
+
+        log = self.build("/ssg/")
+        self.assertEqual(self.converted(log), ["blog/tom.md", "index.md"])
+
+    def test_removed_source_deletes_output(self):
+        os.remove(os.path.join(self.source, "blog", "tom.md"))
+
+        log = self.build()
+
+        self.assertIn("Rendered 0, unchanged 1, removed 1", log)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog")))
+        self.assertTrue(os.path.isfile(os.path.join(self.docs, "index.html")))
+
+    def test_failed_render_is_retried_next_build(self):
+        write(os.path.join(self.source, "index.md"), "no title")
+        write(os.path.join(self.source, "about.md"), "# About")
+
+        log = self.build()
+
+        self.assertIn("Failed to generate 1 page(s)", log)
+        with open(self.manifest) as file:
+            pages = json.load(file)["pages"]
+        self.assertEqual(
+            sorted(os.path.relpath(path, self.source) for path in pages),
+            ["blog/tom.md", "index.md"],
+        )
+
+        write(os.path.join(self.source, "index.md"), "# Home again")
+        self.assertEqual(self.converted(self.build()), ["about.md", "index.md"])
+        self.assertEqual(self.converted(self.build()), [])
+
+
+class TestIncrementalImages(unittest.TestCase):
+    def test_only_pages_referencing_changed_image_rerender(self):
+        pages = {
+            "owl.md": "# Owl\n\n![owl](/owl.gif)",
+            "cat.md": "# Cat\n\n![cat](/cat.gif)",
+        }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            source, template = make_site(tmp, pages)
+            static = os.path.join(tmp, "static")
+            docs = os.path.join(tmp, "docs")
+            write(os.path.join(static, "owl.gif"), "GIF89a\x10\x00\x10\x00")
+            write(os.path.join(static, "cat.gif"), "GIF89a\x10\x00\x10\x00")
+            manifest = os.path.join(tmp, "manifest.json")
+
+            def build():
+                set_image_processor(
+                    ImagePipeline(static, docs, os.path.join(tmp, "cache"))
+                )
+                out = io.StringIO()
+                try:
+                    with contextlib.redirect_stdout(out):
+                        incremental_generate_html(
+                            source, template, docs, "/", manifest
+                        )
+                finally:
+                    set_image_processor(None)
+                return out.getvalue()
+
+            build()
+            write(os.path.join(static, "cat.gif"), "GIF89a\x20\x00\x20\x00\x00")
+            log = build()
+
+            self.assertIn(" * converting " + os.path.join(source, "cat.md"), log)
+            self.assertNotIn(os.path.join(source, "owl.md"), log)
+            with open(os.path.join(docs, "cat.html")) as file:
+                self.assertIn('width="32"', file.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
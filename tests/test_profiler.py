@@ -0,0 +1,91 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import profiler
+from generator import page_generator
+from generator.html_cache import HTMLCache
+from generator.page_generator import traverse_and_generate_html
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(text)
+
+
+def profile_build(tmp, cache=None, streaming_threshold=None):
+    source = os.path.join(tmp, "content")
+    template = os.path.join(tmp, "template.html")
+    write(template, "<title>{{ Title }}</title>{{ Content }}")
+    write(os.path.join(source, "index.md"), "# Home\n\nSee **[Tom](/tom)**.")
+    write(os.path.join(source, "tom.md"), "# Tom\n\n- a _b_")
+
+    original = page_generator.STREAMING_THRESHOLD_BYTES
+    if streaming_threshold is not None:
+        page_generator.STREAMING_THRESHOLD_BYTES = streaming_threshold
+    profiler.enable()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            traverse_and_generate_html(
+                source, template, os.path.join(tmp, "docs"), "/", cache=cache
+            )
+        return profiler.report()
+    finally:
+        profiler.disable()
+        page_generator.STREAMING_THRESHOLD_BYTES = original
+
+
+class TestProfiler(unittest.TestCase):
+    def test_parsed_build_reports_stages_and_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report = profile_build(tmp)
+
+        self.assertEqual(
+            set(report["stages"]),
+            {
+                "directory walk",
+                "front matter",
+                "read",
+                "block parse",
+                "inline parse",
+                "html serialize + write",
+                "page (other)",
+            },
+        )
+        self.assertEqual(report["stages"]["read"]["calls"], 2)
+        self.assertEqual(
+            sorted(os.path.basename(row["page"]) for row in report["pages"]),
+            ["index.md", "tom.md"],
+        )
+        for row in report["pages"]:
+            self.assertEqual(set(row), {"page", "wall", "cpu"})
+            self.assertGreaterEqual(row["wall"], 0)
+
+    def test_cached_build_reports_serialize_and_template_fill(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report = profile_build(tmp, cache=HTMLCache(os.path.join(tmp, "cache")))
+
+        for name in ("html cache", "html serialize", "template fill", "write"):
+            self.assertEqual(report["stages"][name]["calls"], 2)
+
+    def test_streamed_build_reports_parsing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report = profile_build(tmp, streaming_threshold=0)
+
+        for name in ("title", "block parse", "inline parse", "html serialize + write"):
+            self.assertIn(name, report["stages"])
+        self.assertNotIn("read", report["stages"])
+
+    def test_disabled_profiler_records_nothing(self):
+        before = profiler.report()
+        with profiler.stage("read"), profiler.page("index.md"):
+            pass
+
+        self.assertEqual(profiler.report(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
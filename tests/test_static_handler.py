@@ -0,0 +1,122 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from generator.static_handler import (
+    copy_static_files,
+    is_unchanged,
+    remove_orphans,
+    sync_static_files,
+)
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(text)
+
+
+class TestStaticSync(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "static")
+        self.target = os.path.join(self.tmp.name, "docs")
+        self.manifest = os.path.join(self.tmp.name, "cache", "static.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self, **kwargs):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            sync_static_files(self.source, self.target, self.manifest, **kwargs)
+
+        return out.getvalue()
+
+    def test_sync_copies_and_skips_unchanged(self):
+        write(os.path.join(self.source, "images", "cat.png"), "cat")
+        self.sync()
+
+        copied = os.path.join(self.target, "images", "cat.png")
+        self.assertTrue(os.path.isfile(copied))
+        self.assertTrue(
+            is_unchanged(os.path.join(self.source, "images", "cat.png"), copied)
+        )
+
+    def test_sync_removes_orphans_but_keeps_pages(self):
+        write(os.path.join(self.source, "old.css"), "old")
+        write(os.path.join(self.target, "index.html"), "<html></html>")
+        self.sync()
+
+        os.remove(os.path.join(self.source, "old.css"))
+        self.sync()
+
+        self.assertFalse(os.path.exists(os.path.join(self.target, "old.css")))
+        self.assertTrue(os.path.isfile(os.path.join(self.target, "index.html")))
+
+    def test_sync_link_shares_inode(self):
+        write(os.path.join(self.source, "index.css"), "body {}")
+        self.sync(link=True)
+
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(self.source, "index.css"),
+                os.path.join(self.target, "index.css"),
+            )
+        )
+
+    def test_copy_uses_workers_and_reports_each_file(self):
+        names = [os.path.join(f"dir{index % 3}", f"{index}.txt") for index in range(20)]
+        for name in names:
+            write(os.path.join(self.source, name), name)
+        write(os.path.join(self.target, "stale.txt"), "stale")
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            copied = copy_static_files(
+                self.source, self.target, workers=4, verbose=True
+            )
+
+        self.assertEqual(copied, sorted(names))
+        self.assertFalse(os.path.exists(os.path.join(self.target, "stale.txt")))
+        for name in names:
+            dest_path = os.path.join(self.target, name)
+            with open(dest_path) as file:
+                self.assertEqual(file.read(), name)
+            source_path = os.path.join(self.source, name)
+            self.assertIn(f" * {source_path} -> {dest_path}\n", out.getvalue())
+        self.assertIn("Copied 20 file(s)", out.getvalue())
+
+    def test_sync_verbose_reports_copies_and_removals(self):
+        write(os.path.join(self.source, "old.css"), "old")
+        self.assertIn(" -> ", self.sync(verbose=True))
+
+        os.remove(os.path.join(self.source, "old.css"))
+        log = self.sync(verbose=True)
+
+        self.assertIn(f" * removing {os.path.join(self.target, 'old.css')}", log)
+        self.assertIn("Unchanged 0, removed 1 static file(s)", log)
+
+    def test_checksum_detects_same_size_edit(self):
+        src_path = os.path.join(self.source, "a.txt")
+        dest_path = os.path.join(self.target, "a.txt")
+        write(src_path, "aaaa")
+        write(dest_path, "bbbb")
+
+        self.assertFalse(is_unchanged(src_path, dest_path, checksum=True))
+
+    def test_remove_orphans_keeps_listed_outputs(self):
+        write(os.path.join(self.target, "index.html"), "<html></html>")
+        write(os.path.join(self.target, "old", "index.html"), "<html></html>")
+
+        removed = remove_orphans(self.target, {"index.html"})
+
+        self.assertEqual(removed, 1)
+        self.assertTrue(os.path.isfile(os.path.join(self.target, "index.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.target, "old")))
+
+
+if __name__ == "__main__":
+    unittest.main()
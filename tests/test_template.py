@@ -0,0 +1,80 @@
+import io
+import os
+import tempfile
+import unittest
+
+from markdown.htmlnode import LeafNode, ParentNode
+from generator.template import (
+    Template,
+    load_template,
+    rewrite_basepath,
+    resolve_template,
+)
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render_slots(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        html = template.render("/", Title="Hello", Content="<p>Body</p>")
+
+        self.assertEqual(html, "<title>Hello</title><main><p>Body</p></main>")
+
+    def test_render_basepath(self):
+        template = Template('<link href="/index.css" /><img src="/logo.png" />')
+        html = template.render("/ssg/")
+
+        self.assertEqual(
+            html, '<link href="/ssg/index.css" /><img src="/ssg/logo.png" />'
+        )
+
+    def test_unknown_slot_is_kept(self):
+        template = Template("<p>{{ Author }}</p>")
+
+        self.assertEqual(template.render("/"), "<p>{{ Author }}</p>")
+
+    def test_content_is_not_reparsed(self):
+        template = Template("<main>{{ Content }}</main>")
+        html = template.render("/", Content="{{ Title }}")
+
+        self.assertEqual(html, "<main>{{ Title }}</main>")
+
+    def test_write_streams_node_content(self):
+        template = Template('<a href="/">{{ Title }}</a>{{ Content }}')
+        node = ParentNode("p", [LeafNode("a", "Blog", {"href": "/blog"})])
+        out = io.StringIO()
+
+        template.write(out, "/ssg/", Title="Home", Content=node)
+
+        self.assertEqual(
+            out.getvalue(), '<a href="/ssg/">Home</a><p><a href="/ssg/blog">Blog</a></p>'
+        )
+
+    def test_rewrite_basepath(self):
+        html = '<a href="/blog">Blog</a><img src="/cat.png" alt="cat"></img>'
+
+        self.assertEqual(
+            rewrite_basepath(html, "/ssg/"),
+            '<a href="/ssg/blog">Blog</a><img src="/ssg/cat.png" alt="cat"></img>',
+        )
+        self.assertIs(rewrite_basepath(html, "/"), html)
+
+    def test_load_template_is_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w") as file:
+                file.write("{{ Content }}")
+
+            self.assertIs(load_template(path), load_template(path))
+
+    def test_resolve_template_falls_back_to_default(self):
+        template_path = resolve_template(
+            os.path.join("content", "missing-section", "index.md"),
+            "content",
+            "template.html",
+        )
+
+        self.assertEqual(template_path, "template.html")
+
+
+if __name__ == "__main__":
+    unittest.main()
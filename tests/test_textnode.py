@@ -50,6 +50,12 @@ class TestTextNodeToHTMLNode(unittest.TestCase):
         self.assertEqual(html_node.tag, "b")
         self.assertEqual(html_node.value, "This is bold")
 
+    def test_nodes_have_no_instance_dict(self):
+        node = TextNode("This is bold", TextType.BOLD)
+        html_node = text_node_to_html_node(node)
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertFalse(hasattr(html_node, "__dict__"))
+
 
 if __name__ == "__main__":
     unittest.main()
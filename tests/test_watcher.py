@@ -0,0 +1,82 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from generator.page_generator import traverse_and_generate_html
+from generator.watcher import SiteWatcher, snapshot, diff_snapshots, is_within
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        file.write(text)
+
+
+class TestWatcher(unittest.TestCase):
+    def test_diff_snapshots(self):
+        before = {"a.md": (1, 10), "b.md": (1, 10), "c.md": (1, 10)}
+        after = {"a.md": (1, 10), "b.md": (2, 12), "d.md": (1, 5)}
+
+        changed, removed = diff_snapshots(before, after)
+
+        self.assertEqual(changed, {"b.md", "d.md"})
+        self.assertEqual(removed, {"c.md"})
+
+    def test_snapshot_walks_directories_and_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            nested = os.path.join(tmp, "content", "blog")
+            os.makedirs(nested)
+            page = os.path.join(nested, "index.md")
+            template = os.path.join(tmp, "template.html")
+            for path in (page, template):
+                with open(path, "w") as file:
+                    file.write("x")
+
+            state = snapshot(
+                [os.path.join(tmp, "content"), template, os.path.join(tmp, "missing")]
+            )
+
+            self.assertEqual(set(state), {page, template})
+
+    def test_rebuild_updates_listings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "content")
+            docs = os.path.join(tmp, "docs")
+            template = os.path.join(tmp, "template.html")
+            manifest = os.path.join(tmp, "listings.json")
+            write(template, "{{ Content }}")
+            write(os.path.join(source, "index.md"), "# Home")
+            write(os.path.join(source, "blog", "tom", "index.md"), "# Tom")
+            new_post = os.path.join(source, "blog", "owl", "index.md")
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                records, _ = traverse_and_generate_html(
+                    source, template, docs, "/", listing_manifest_path=manifest
+                )
+                watcher = SiteWatcher(
+                    source,
+                    os.path.join(tmp, "static"),
+                    template,
+                    os.path.join(tmp, "templates"),
+                    docs,
+                    "/",
+                    records=records,
+                    listing_manifest_path=manifest,
+                )
+                write(new_post, "# Owl")
+                watcher.rebuild({new_post}, set())
+
+            with open(os.path.join(docs, "blog", "index.html")) as file:
+                listing = file.read()
+            self.assertIn('<a href="/blog/owl">Owl</a>', listing)
+            self.assertIn('<a href="/blog/tom">Tom</a>', listing)
+
+    def test_is_within(self):
+        self.assertTrue(is_within(os.path.join("content", "index.md"), "content"))
+        self.assertFalse(is_within(os.path.join("contents", "index.md"), "content"))
+
+
+if __name__ == "__main__":
+    unittest.main()